@@ -26,6 +26,12 @@ from video import BilibiliVideoManager, VideoDownloader
 from dynamic import BilibiliDynamicManager
 
 
+async def run_video_command(video_manager: BilibiliVideoManager, method, *args, **kwargs):
+    """在视频管理器的生命周期内执行命令，结束后关闭共享的HTTP会话"""
+    async with video_manager:
+        return await method(*args, **kwargs)
+
+
 def main():
     """主函数"""
     # 修复Windows控制台编码问题
@@ -68,6 +74,8 @@ def main():
                       help='日志文件路径 (默认: logs.txt)')
     parser.add_argument('--show-formats', action='store_true', 
                       help='显示可用的画质格式信息')
+    parser.add_argument('--pipe-mux', action='store_true',
+                      help='音视频流经管道直接交给ffmpeg合并，不写临时文件 (仅Linux/macOS，不支持断点续传)')
     
     subparsers = parser.add_subparsers(dest='command', help='可用命令')
     
@@ -184,7 +192,8 @@ def main():
             max_concurrent=getattr(args, 'concurrent', 1),
             credential=credential,
             preferred_quality=getattr(args, 'quality', 'auto'),
-            log_file=args.log_file
+            log_file=args.log_file,
+            pipe_mux=args.pipe_mux
         )
         
         # 创建动态管理器
@@ -200,20 +209,20 @@ def main():
         
         # 执行命令
         if args.command == 'list-videos':
-            asyncio.run(video_manager.list_user_videos(args.uid))
+            asyncio.run(run_video_command(video_manager, video_manager.list_user_videos, args.uid))
         elif args.command == 'download-video':
             download_danmaku = not args.no_danmaku
-            asyncio.run(video_manager.download_single_video(args.bvid, download_danmaku=download_danmaku))
+            asyncio.run(run_video_command(video_manager, video_manager.download_single_video, args.bvid, download_danmaku=download_danmaku))
         elif args.command == 'download-user':
             download_danmaku = not args.no_danmaku
-            asyncio.run(video_manager.download_user_videos(args.uid, download_danmaku=download_danmaku))
+            asyncio.run(run_video_command(video_manager, video_manager.download_user_videos, args.uid, download_danmaku=download_danmaku))
         elif args.command == 'list-series':
-            asyncio.run(video_manager.list_user_collections(args.uid))
+            asyncio.run(run_video_command(video_manager, video_manager.list_user_collections, args.uid))
         elif args.command == 'list-series-videos':
-            asyncio.run(video_manager.list_collection_videos(args.series_id, args.type))
+            asyncio.run(run_video_command(video_manager, video_manager.list_collection_videos, args.series_id, args.type))
         elif args.command == 'download-series':
             download_danmaku = not args.no_danmaku
-            asyncio.run(video_manager.download_collection_videos(args.series_id, args.type, download_danmaku=download_danmaku))
+            asyncio.run(run_video_command(video_manager, video_manager.download_collection_videos, args.series_id, args.type, download_danmaku=download_danmaku))
         elif args.command == 'list-dynamics':
             asyncio.run(dynamic_manager.list_user_dynamics(args.uid, args.limit))
         elif args.command == 'download-dynamics':
@@ -8,32 +8,69 @@
 """
 
 import asyncio
+import contextvars
 import logging
+import random
 import sys
 import traceback
-from functools import wraps
-from typing import Optional
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, List, Optional
 
 from bilibili_api.exceptions import ResponseCodeException, NetworkException
 
 
-def api_retry_decorator(max_retries=5, initial_wait_time=3):
+API_CONCURRENCY = 16   # 全局同时进行的API请求数上限
+RETRY_MAX_WAIT = 60    # 单次退避等待上限（秒）
+
+# 所有被 api_retry_decorator 装饰的请求共享的并发限制，按事件循环惰性创建
+_api_semaphore: Optional[asyncio.Semaphore] = None
+_api_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+# 当前任务是否已占用API并发名额（装饰的函数互相调用时不重复获取，避免死锁）
+_in_api_call: contextvars.ContextVar = contextvars.ContextVar('_in_api_call', default=False)
+
+
+def _get_api_semaphore() -> asyncio.Semaphore:
+    """获取当前事件循环的全局API并发信号量"""
+    global _api_semaphore, _api_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _api_semaphore is None or _api_semaphore_loop is not loop:
+        _api_semaphore = asyncio.Semaphore(API_CONCURRENCY)
+        _api_semaphore_loop = loop
+    return _api_semaphore
+
+
+async def _call_with_api_limit(func, *args, **kwargs):
+    """在全局API并发名额内执行请求"""
+    if _in_api_call.get():
+        return await func(*args, **kwargs)
+    token = _in_api_call.set(True)
+    try:
+        async with _get_api_semaphore():
+            return await func(*args, **kwargs)
+    finally:
+        _in_api_call.reset(token)
+
+
+def api_retry_decorator(max_retries=5, initial_wait_time=3, quiet=False):
     """
     Bilibili API 请求重试装饰器
 
+    所有被装饰的请求共享 API_CONCURRENCY 个并发名额；限流时按指数退避并加入随机抖动，
+    避免大量并发请求在同一时刻集中重试。
+
     Args:
         max_retries: 最大重试次数
         initial_wait_time: 初始等待时间（秒）
+        quiet: 接口返回错误码属于预期情况（如探测请求）时直接返回None，不记录错误堆栈
     """
     def decorator(func):
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
             retries = max_retries
-            current_wait_time = initial_wait_time
 
             while retries > 0:
                 try:
-                    return await func(self, *args, **kwargs)
+                    return await _call_with_api_limit(func, self, *args, **kwargs)
                 except (ResponseCodeException, NetworkException) as e:
                     if "-352" in str(e):
                         self.logger.warning("Credential expired (-352). Refreshing...")
@@ -49,11 +86,16 @@ def api_retry_decorator(max_retries=5, initial_wait_time=3):
                         else:
                             self.logger.error("Credential expired (-352), but cannot refresh without 'ac_time_value'. Please update your credentials.")
                             break
-                    elif "412" in str(e):
-                        self.logger.warning(f"Request rate-limited (412). Retrying in {current_wait_time} seconds... ({retries-1} retries left)")
-                        await asyncio.sleep(current_wait_time)
-                        current_wait_time *= 2  # 指数退避
+                    elif "412" in str(e) or getattr(e, 'status', None) == 429:
+                        # 指数退避（有上限）+ 随机抖动，等待期间不占用并发名额
+                        attempt = max_retries - retries
+                        wait_time = min(RETRY_MAX_WAIT, initial_wait_time * 2 ** attempt) * random.uniform(0.5, 1.5)
+                        self.logger.warning(f"Request rate-limited ({getattr(e, 'status', 412)}). Retrying in {wait_time:.1f} seconds... ({retries-1} retries left)")
+                        await asyncio.sleep(wait_time)
                         retries -= 1
+                    elif quiet and isinstance(e, ResponseCodeException):
+                        self.logger.debug(f"{func.__name__} returned API error: {e}")
+                        return None
                     else:
                         self.logger.error(f"An unexpected API error occurred: {e}")
                         self.logger.error(traceback.format_exc())
@@ -70,6 +112,94 @@ def api_retry_decorator(max_retries=5, initial_wait_time=3):
     return decorator
 
 
+async def run_in_thread(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    在默认线程池中执行阻塞函数，避免阻塞事件循环
+
+    Args:
+        func: 阻塞函数
+        *args, **kwargs: 传递给函数的参数
+
+    Returns:
+        函数的返回值
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+
+async def gather_limited(limit: int, *aws: Awaitable, return_exceptions: bool = False) -> List[Any]:
+    """
+    并发执行多个协程，但同一时刻最多运行 limit 个
+
+    Args:
+        limit: 最大并发数
+        *aws: 待执行的协程
+        return_exceptions: 同 asyncio.gather
+
+    Returns:
+        与传入顺序一致的结果列表
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _bounded(aw: Awaitable) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_bounded(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+class AdmissionController:
+    """
+    可动态调整上限的并发准入控制器
+
+    与 asyncio.Semaphore 不同，运行中可以通过 set_limit 安全地调大或调小并发上限：
+    调大时立即唤醒等待者，调小时已在运行的任务不受影响，新任务等待计数回落。
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit: 最大并发数
+        """
+        self._active = 0
+        self._cmax = max(1, limit)
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        return self._cmax
+
+    @property
+    def active(self) -> int:
+        """当前正在运行的任务数"""
+        return self._active
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            while self._active >= self._cmax:
+                await self._cond.wait()
+            self._active += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def set_limit(self, limit: int) -> None:
+        """调整并发上限"""
+        async with self._cond:
+            self._cmax = max(1, limit)
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> "AdmissionController":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.release()
+
+
 def setup_logging(log_file: str = 'logs.txt', logger_name: Optional[str] = None) -> logging.Logger:
     """
     设置统一的日志配置，解决跨平台编码问题
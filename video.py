@@ -13,30 +13,105 @@ import asyncio
 import os
 import json
 import logging
+import math
+import re
 import time
 import traceback
 import shutil
 import platform
-import subprocess
+import sys
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import AsyncIterator, Callable, Dict, NamedTuple, Optional, List, Set, Tuple
 
 import aiohttp
-import aiofiles
+import orjson
 from bilibili_api import video, HEADERS, Credential, user
 from bilibili_api.video import VideoQuality
 from bilibili_api.channel_series import ChannelSeries, ChannelSeriesType, ChannelOrder
 from bilibili_api.utils.danmaku import Danmaku, SpecialDanmaku
 from bilibili_api.exceptions.DanmakuClosedException import DanmakuClosedException
 
-from utils import get_logger, api_retry_decorator
+from utils import get_logger, api_retry_decorator, run_in_thread, gather_limited, AdmissionController
+
+
+# 下载调优参数
+READ_BUFSIZE = 1 << 22          # aiohttp 读缓冲区 4 MiB
+WRITE_BUFFER_SIZE = 1 << 22     # 累积 4 MiB 后再写入磁盘
+PAGE_CONCURRENCY = 4            # 单个视频内同时下载的分P数
+DNS_CACHE_TTL = 600             # DNS 解析结果缓存时间（秒）
+KEEPALIVE_TIMEOUT = 120         # 空闲连接保持时间（秒）
+METADATA_FILENAME = "metadata.json"  # 视频全部分P完成后写入，同时作为下载完成标记
+VIDEO_INFO_CACHE_SIZE = 256     # 视频详情缓存条数
+DOWNLOAD_RETRIES = 3            # 单个文件下载中断后的最大尝试次数（断点续传）
+PROGRESS_INTERVAL = 0.1         # 进度上报/终端刷新最小间隔（秒），约10Hz
+
+# ffmpeg 参数，集中定义便于调优
+# DASH 分段(m4s)以非 seekable 方式读取，避免 ffmpeg 6.0+ 对 DASH 源重封装时反复回溯
+FFMPEG_DASH_INPUT_ARGS = ['-thread_queue_size', '1024', '-seekable', '0']
+# 管道输入(pipe:N)本身不可回溯，pipe 协议也不支持 -seekable 选项
+FFMPEG_PIPE_INPUT_ARGS = ['-thread_queue_size', '1024']
+# FLV 重封装时补全时间戳
+FFMPEG_FLV_INPUT_ARGS = ['-fflags', '+genpts']
+# 仅复制流不重新编码，并将 moov 移到文件头便于边下边播
+FFMPEG_OUTPUT_ARGS = ['-c', 'copy', '-movflags', '+faststart', '-threads', '0']
+
+# 列表接口参数
+USER_VIDEOS_PAGE_SIZE = 30      # 用户投稿列表每页数量
+COLLECTION_PAGE_SIZE = 100      # 合集视频列表每页数量
+PAGE_FETCH_CONCURRENCY = 5      # 分页并发请求数
+COLLECTION_META_CONCURRENCY = 5 # 合集元数据并发请求数
+BATCH_WORKERS = 8               # 批量下载工作协程数下限（超出并发上限的协程在 admission 处等待）
+# 用户名文件夹只保留字母数字(含中日韩文字)、空格、连字符和下划线，正则在C层一次扫描完成
+_UNSAFE_USERNAME_RE = re.compile(r'[^\w \-]+')
+# 合集文件夹名在此基础上额外保留点号
+_UNSAFE_COLLECTION_NAME_RE = re.compile(r'[^\w \-.]+')
+# 凭据相关环境变量，与 load_credentials 的读取顺序一致
+CREDENTIAL_ENV_VARS = ('BILI_SESSDATA', 'BILI_JCT', 'BILI_BUVID3', 'BILI_DEDEUSERID', 'BILI_AC_TIME_VALUE')
+# load_credentials 结果缓存
+_credential_cache: Dict[tuple, Optional[Credential]] = {}
+# 合集视频列表单条输出模板：序号、标题、BV号、时长、播放量
+COLLECTION_LINE_TMPL = "{:3d}. {} [{}]\n     ⏱️  {} | 👁️  {} 播放\n\n"
+# 用户合集列表单条输出模板：序号、名称、ID、类型、视频数、创建日期
+COLLECTION_INFO_TMPL = "{:3d}. {} [ID: {}]\n     📺 类型: {} | 🎬 视频数: {} | 📅 创建: {}\n"
+
+
+@lru_cache(maxsize=4096)
+def _fmt_views(n: int) -> str:
+    """千分位格式化播放量（低播放量取值重复较多，缓存结果）"""
+    return format(n, ',')
+
+
+class CollectionVideo(NamedTuple):
+    """合集中的单个视频条目（轻量只读记录，不为每个视频分配字典）"""
+    title: str
+    bvid: str
+    aid: int
+    duration: int
+    view: int
+    created: int
+
+    @classmethod
+    def from_api(cls, video_info: Dict) -> "CollectionVideo":
+        """从合集视频列表接口返回的条目构造"""
+        return cls(
+            video_info.get('title', 'Unknown'),
+            video_info.get('bvid', ''),
+            video_info.get('aid', 0),
+            video_info.get('duration', 0),
+            video_info.get('stat', {}).get('view', 0),
+            video_info.get('pubdate', 0)
+        )
 
 
 class VideoDownloader:
     """B站视频下载器核心类"""
     
-    def __init__(self, credential: Optional[Credential] = None, preferred_quality: str = "auto", log_file: str = "logs.txt"):
+    def __init__(self, credential: Optional[Credential] = None, preferred_quality: str = "auto", log_file: str = "logs.txt",
+                 max_concurrent: int = 1, mux_semaphore: Optional[asyncio.Semaphore] = None,
+                 progress_callback: Optional[Callable[[str, int, int], None]] = None, pipe_mux: bool = False):
         """
         初始化下载器
         
@@ -44,13 +119,51 @@ class VideoDownloader:
             credential: B站登录凭据(用于高画质下载)
             preferred_quality: 首选画质(auto/1080p60/4k/8k等)
             log_file: 日志文件路径
+            max_concurrent: 最大并发下载数(用于设置连接池大小)
+            mux_semaphore: ffmpeg并发控制信号量(默认按CPU核数创建)
+            progress_callback: 下载进度回调 (描述, 已下载字节, 总字节)，默认输出到终端
+            pipe_mux: DASH音视频流通过管道直接送入ffmpeg，不写临时文件(仅POSIX系统，不支持断点续传)
         """
         self.credential = credential
         self.preferred_quality = preferred_quality
+        self.max_concurrent = max_concurrent
+        self.progress_callback = progress_callback
+        self._default_progress = progress_callback is None
+        # 默认进度输出状态：进行中的下载(文件路径 -> (描述, 已下载, 总大小))，并发下载合并显示在同一行
+        # 以文件路径区分，不同视频的同名描述(如 "P1 视频流")互不覆盖
+        self._active_progress: Dict[str, Tuple[str, int, int]] = {}
+        self._progress_width = 0
+        self._last_render = 0.0
+        # ffmpeg 是CPU密集型任务，与网络下载并发数分开控制
+        self.mux_concurrency = os.cpu_count() or 4
+        self.mux_semaphore = mux_semaphore or asyncio.Semaphore(self.mux_concurrency)
+        
+        # 后台合并队列：下载完成后将ffmpeg任务入队，下载槽位立即释放给下一个视频
+        self._mux_queue: Optional[asyncio.Queue] = None
+        self._mux_workers: List[asyncio.Task] = []
+        self._pending_mux: Dict[str, List[asyncio.Future]] = {}
+        # BVID -> (视频信息, 分P信息, 视频文件夹)，合并全部完成后写入元数据
+        self._pending_metadata: Dict[str, Tuple[Dict, List, Path]] = {}
+        
+        # 视频详情缓存(BVID -> info，按最近使用淘汰)，重试/重复下载时不再请求API
+        self._info_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._info_locks: Dict[str, asyncio.Lock] = {}
+        
+        # 共享的HTTP会话，首次下载时创建，所有文件下载复用同一连接池
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        
+        # check_ffmpeg 结果，进程内 ffmpeg 是否可用不会变化，只检测一次
+        self._ffmpeg_available: Optional[bool] = None
         
         # 使用统一的日志配置
         self.logger = get_logger('VideoDownloader', log_file)
         
+        # 管道合并依赖 pass_fds 传递文件描述符，Windows 不支持
+        self.pipe_mux = pipe_mux and os.name == 'posix'
+        if pipe_mux and not self.pipe_mux:
+            self.logger.warning("当前系统不支持管道合并，使用临时文件合并")
+        
         # 输出登录状态和画质信息
         if self.credential:
             self.logger.info("✅ 已加载登录凭据，支持高画质下载")
@@ -63,6 +176,9 @@ class VideoDownloader:
         """
         从配置文件或环境变量加载登录凭据
         
+        结果按 (配置文件路径, 文件修改时间, 环境变量取值) 缓存，
+        配置文件或环境变量未变化时重复调用直接返回同一个 Credential。
+        
         Args:
             config_path: 配置文件路径 (JSON格式)
             log_file: 日志文件路径
@@ -70,6 +186,18 @@ class VideoDownloader:
         Returns:
             Credential对象，如果无法加载则返回None
         """
+        try:
+            mtime = os.stat(config_path).st_mtime_ns if config_path else None
+        except OSError:
+            mtime = None
+        cache_key = (config_path, mtime, tuple(os.getenv(name) for name in CREDENTIAL_ENV_VARS))
+        if cache_key not in _credential_cache:
+            _credential_cache[cache_key] = VideoDownloader._load_credentials(config_path, log_file)
+        return _credential_cache[cache_key]
+    
+    @staticmethod
+    def _load_credentials(config_path: Optional[str], log_file: str) -> Optional[Credential]:
+        """从配置文件或环境变量加载登录凭据（不使用缓存）"""
         # 使用统一的日志配置
         logger = get_logger('CredentialLoader', log_file)
         
@@ -116,34 +244,34 @@ class VideoDownloader:
         
         if config_path and Path(config_path).exists():
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    
-                    # 检查每个字段是否被配置文件覆盖
-                    new_sessdata = config.get('SESSDATA', sessdata)
-                    if new_sessdata != sessdata:
-                        file_sources.append('SESSDATA')
-                        sessdata = new_sessdata
-                    
-                    new_bili_jct = config.get('bili_jct', bili_jct)
-                    if new_bili_jct != bili_jct:
-                        file_sources.append('bili_jct')
-                        bili_jct = new_bili_jct
-                    
-                    new_buvid3 = config.get('buvid3', buvid3)
-                    if new_buvid3 != buvid3:
-                        file_sources.append('buvid3')
-                        buvid3 = new_buvid3
-                    
-                    new_dedeuserid = config.get('DedeUserID', dedeuserid)
-                    if new_dedeuserid != dedeuserid:
-                        file_sources.append('DedeUserID')
-                        dedeuserid = new_dedeuserid
-                    
-                    new_ac_time_value = config.get('ac_time_value', ac_time_value)
-                    if new_ac_time_value != ac_time_value:
-                        file_sources.append('ac_time_value')
-                        ac_time_value = new_ac_time_value
+                # 直接按字节读取并解析（json.loads 自动识别UTF-8编码），省去文本模式的解码包装
+                config = json.loads(Path(config_path).read_bytes())
+                
+                # 检查每个字段是否被配置文件覆盖
+                new_sessdata = config.get('SESSDATA', sessdata)
+                if new_sessdata != sessdata:
+                    file_sources.append('SESSDATA')
+                    sessdata = new_sessdata
+                
+                new_bili_jct = config.get('bili_jct', bili_jct)
+                if new_bili_jct != bili_jct:
+                    file_sources.append('bili_jct')
+                    bili_jct = new_bili_jct
+                
+                new_buvid3 = config.get('buvid3', buvid3)
+                if new_buvid3 != buvid3:
+                    file_sources.append('buvid3')
+                    buvid3 = new_buvid3
+                
+                new_dedeuserid = config.get('DedeUserID', dedeuserid)
+                if new_dedeuserid != dedeuserid:
+                    file_sources.append('DedeUserID')
+                    dedeuserid = new_dedeuserid
+                
+                new_ac_time_value = config.get('ac_time_value', ac_time_value)
+                if new_ac_time_value != ac_time_value:
+                    file_sources.append('ac_time_value')
+                    ac_time_value = new_ac_time_value
                 
                 if file_sources:
                     logger.info(f"📄 从配置文件更新: {', '.join(file_sources)}")
@@ -192,28 +320,23 @@ class VideoDownloader:
             print(f"⚠️  凭据创建失败: {e}")
             return None
     
+    # 字符映射表：将有问题的字符替换为全角等效字符
+    _FILENAME_TRANS = str.maketrans({
+        '/': '／',    # 全角斜杠
+        '?': '？',    # 中文问号
+        ':': '：',    # 中文冒号
+        '<': '〈',    # 全角小于号
+        '>': '〉',    # 全角大于号
+        '|': '｜',    # 全角竖线
+        '"': '"',    # 中文双引号
+        '*': '＊',    # 全角星号
+        '\\': '＼',   # 全角反斜杠
+    })
+    
     def _safe_filename_chars(self, text: str, max_length: int = 255) -> str:
         """处理文件名中的字符，确保跨平台兼容性"""
-        # 字符映射表：将有问题的字符替换为全角等效字符
-        char_map = {
-            '/': '／',    # 全角斜杠
-            '?': '？',    # 中文问号
-            ':': '：',    # 中文冒号
-            '<': '〈',    # 全角小于号
-            '>': '〉',    # 全角大于号
-            '|': '｜',    # 全角竖线
-            '"': '"',    # 中文双引号
-            '*': '＊',    # 全角星号
-            '\\': '＼',   # 全角反斜杠
-        }
-        
-        # 应用字符映射
-        safe_text = text
-        for old_char, new_char in char_map.items():
-            safe_text = safe_text.replace(old_char, new_char)
-        
-        # 移除首尾空格并限制长度
-        return safe_text.strip()[:max_length]
+        # 一次遍历完成全部字符替换，移除首尾空格并限制长度
+        return text.translate(self._FILENAME_TRANS).strip()[:max_length]
     
     def get_safe_filename(self, title: str, bvid: str) -> str:
         """生成安全的文件名"""
@@ -235,11 +358,16 @@ class VideoDownloader:
                 "downloader_version": "bili_downloader_v1.0"
             }
             
-            metadata_path = folder_path / "metadata.json"
-            async with aiofiles.open(metadata_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(metadata, ensure_ascii=False, indent=2))
+            metadata_path = folder_path / METADATA_FILENAME
+            try:
+                payload = orjson.dumps(metadata, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            except orjson.JSONEncodeError:
+                # orjson 不支持超出64位的整数等少数情况，回退到标准库
+                payload = json.dumps(metadata, ensure_ascii=False, indent=2).encode('utf-8')
+            # 小文件一次性写入，只需一次线程切换
+            await run_in_thread(metadata_path.write_bytes, payload)
             
-            print(f"📋 元数据已保存: metadata.json")
+            print(f"📋 元数据已保存: {METADATA_FILENAME}")
             return True
         except Exception as e:
             self.logger.error(f"保存元数据失败: {e}")
@@ -247,71 +375,365 @@ class VideoDownloader:
             return False
     
     @api_retry_decorator()
-    async def get_video_info(self, bvid: str) -> Dict:
-        """获取单个视频信息"""
-        try:
-            v = video.Video(bvid=bvid, credential=self.credential)
-            info = await v.get_info()
+    async def get_video_info(self, bvid: str, v: Optional[video.Video] = None) -> Dict:
+        """获取单个视频信息（可传入已创建的视频对象以复用；结果按BVID缓存）"""
+        cached = self._info_cache.get(bvid)
+        if cached is not None:
+            self._info_cache.move_to_end(bvid)
+            return cached
+        
+        # 同一视频的并发请求只发一次，其余等待同一结果
+        lock = self._info_locks.setdefault(bvid, asyncio.Lock())
+        async with lock:
+            cached = self._info_cache.get(bvid)
+            if cached is not None:
+                return cached
+            try:
+                v = v or video.Video(bvid=bvid, credential=self.credential)
+                info = await v.get_info()
+            except Exception as e:
+                self.logger.error(f"获取视频信息失败: {e}")
+                return {}
+            finally:
+                self._info_locks.pop(bvid, None)
+            
+            self._info_cache[bvid] = info
+            if len(self._info_cache) > VIDEO_INFO_CACHE_SIZE:
+                self._info_cache.popitem(last=False)
             return info
-        except Exception as e:
-            self.logger.error(f"获取视频信息失败: {e}")
-            return {}
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享的HTTP会话（惰性创建）"""
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                # 每个视频最多 PAGE_CONCURRENCY 个分P同时下载，每个分P含视频/音频两路流，
+                # 且通常来自同一CDN域名，单域名连接数须容纳全部流，否则多出的分P只会在连接池中排队
+                max_streams = self.max_concurrent * PAGE_CONCURRENCY * 2
+                # CDN 域名较多：DNS 结果缓存 10 分钟，空闲连接保持 2 分钟供后续分P/视频复用
+                # （安装 aiodns 时 aiohttp 默认即使用异步解析器）
+                connector = aiohttp.TCPConnector(
+                    limit=max_streams * 2,
+                    limit_per_host=max_streams,
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT
+                )
+                timeout = aiohttp.ClientTimeout(total=None, sock_read=60, sock_connect=30)
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=timeout,
+                    read_bufsize=READ_BUFSIZE
+                )
+            return self._session
+    
+    async def aclose(self) -> None:
+        """关闭共享的HTTP会话并停止后台合并协程（之后再次下载会重新创建）"""
+        for worker in self._mux_workers:
+            worker.cancel()
+        if self._mux_workers:
+            await asyncio.gather(*self._mux_workers, return_exceptions=True)
+        self._mux_workers = []
+        
+        # 队列中尚未执行的合并任务不会再有人处理，标记为失败，避免等待方永远挂起
+        # （已出队的任务由 _wait_for_mux 持有，其 Future 同样在这里结束）
+        if self._mux_queue is not None:
+            while not self._mux_queue.empty():
+                *_, future = self._mux_queue.get_nowait()
+                if not future.done():
+                    future.set_result(False)
+        for futures in self._pending_mux.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(False)
+        self._pending_mux.clear()
+        self._mux_queue = None
+        
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    @staticmethod
+    def _resume_marker_path(file_path: Path) -> Path:
+        """断点续传标记文件路径（记录文件总大小）"""
+        return file_path.with_name(file_path.name + '.part')
+    
+    @staticmethod
+    def _partial_output_path(video_path: Path) -> Path:
+        """ffmpeg 输出的临时路径，成功后再重命名为正式文件，保证正式文件一定完整"""
+        return video_path.with_name(f"{video_path.stem}.part{video_path.suffix}")
+    
+    async def _remove_temp_files(self, temp_files: List[Path]) -> None:
+        """删除已合并的临时流文件及其续传标记"""
+        for temp_file in temp_files:
+            await run_in_thread(temp_file.unlink, missing_ok=True)
+            await run_in_thread(self._resume_marker_path(temp_file).unlink, missing_ok=True)
+    
+    @staticmethod
+    def is_video_folder_complete(video_folder: Path) -> bool:
+        """视频文件夹中存在元数据文件即表示全部分P已下载完成"""
+        return (video_folder / METADATA_FILENAME).exists()
+    
+    @staticmethod
+    def list_completed_video_folders(download_folder: Path) -> Set[str]:
+        """列出下载目录中已完整下载的视频文件夹名"""
+        try:
+            with os.scandir(download_folder) as entries:
+                return {entry.name for entry in entries
+                        if entry.is_dir() and os.path.exists(os.path.join(entry.path, METADATA_FILENAME))}
+        except FileNotFoundError:
+            return set()
+    
+    @staticmethod
+    def _list_folder(folder: Path) -> Set[str]:
+        """列出文件夹中的文件名，文件夹不存在时返回空集合"""
+        try:
+            with os.scandir(folder) as entries:
+                return {entry.name for entry in entries}
+        except FileNotFoundError:
+            return set()
+    
+    @staticmethod
+    def _write_all(fd: int, data: bytearray) -> None:
+        """将数据完整写入文件描述符（os.write 可能只写入一部分）"""
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            offset += os.write(fd, view[offset:])
+    
+    @staticmethod
+    def _read_file_header(file_path: Path, size: int) -> bytes:
+        """读取文件开头的若干字节"""
+        with open(file_path, 'rb') as f:
+            return f.read(size)
+    
+    def _progress_reporter(self, key: str) -> Callable[[str, int, int], None]:
+        """获取某个下载的进度上报函数：自定义回调直接使用，默认输出按 key 区分各下载"""
+        if self._default_progress:
+            return partial(self._print_progress, key)
+        return self.progress_callback
+    
+    def _print_progress(self, key: str, desc: str, downloaded: int, total_size: int) -> None:
+        """默认进度输出：并发下载的各文件进度合并为一行，在终端同一行刷新"""
+        if total_size <= 0:
+            return
+        self._active_progress[key] = (desc, downloaded, total_size)
+        # 多个下载同时上报时整体限制刷新频率
+        now = time.monotonic()
+        if now - self._last_render >= PROGRESS_INTERVAL:
+            self._last_render = now
+            self._render_progress()
+    
+    def _render_progress(self) -> None:
+        """重绘进度行，用空格覆盖上一次较长的输出"""
+        if len(self._active_progress) == 1:
+            (desc, downloaded, total_size), = self._active_progress.values()
+            line = f"{desc}: {downloaded / total_size * 100:.1f}% ({downloaded}/{total_size})"
+        else:
+            line = " | ".join(f"{desc}: {downloaded / total_size * 100:.1f}%"
+                              for desc, downloaded, total_size in self._active_progress.values())
+        print(f"\r{line.ljust(self._progress_width)}", end="", flush=True)
+        self._progress_width = len(line)
+    
+    def _finish_progress(self, key: str) -> None:
+        """输出某个文件的最终进度并换行，其余进行中的下载在新的一行继续刷新"""
+        state = self._active_progress.pop(key, None)
+        if state is None:
+            return
+        desc, downloaded, total_size = state
+        line = f"{desc}: {downloaded / total_size * 100:.1f}% ({downloaded}/{total_size})"
+        print(f"\r{line.ljust(self._progress_width)}")
+        self._progress_width = 0
+        if self._active_progress:
+            self._render_progress()
     
     async def download_file(self, url: str, file_path: Path, desc: str = "下载") -> bool:
-        """下载单个文件"""
+        """下载单个文件，网络中断时通过 HTTP Range 从已下载位置续传"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=HEADERS) as response:
-                    if response.status == 200:
-                        total_size = int(response.headers.get('content-length', 0))
-                        downloaded = 0
-                        
-                        async with aiofiles.open(file_path, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                await f.write(chunk)
-                                downloaded += len(chunk)
-                                if total_size > 0:
-                                    progress = (downloaded / total_size) * 100
-                                    print(f"\r{desc}: {progress:.1f}% ({downloaded}/{total_size})", end="")
-                        print()  # 换行
-                        return True
-                    else:
-                        self.logger.error(f"{desc}失败: HTTP {response.status}")
+            for attempt in range(1, DOWNLOAD_RETRIES + 1):
+                try:
+                    return await self._download_file_once(url, file_path, desc)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == DOWNLOAD_RETRIES:
+                        self.logger.error(f"{desc}出错: {e}")
                         return False
-        except Exception as e:
-            self.logger.error(f"{desc}出错: {e}")
+                    self.logger.warning(f"{desc}中断: {e}，第{attempt}次重试(断点续传)...")
+                except Exception as e:
+                    self.logger.error(f"{desc}出错: {e}")
+                    return False
             return False
+        finally:
+            # 下载中断时从进度行中移除
+            self._active_progress.pop(str(file_path), None)
     
-    async def download_single_video(self, bvid: str, download_folder: Path, semaphore: Optional[asyncio.Semaphore] = None, download_danmaku: bool = True) -> bool:
+    async def _download_file_once(self, url: str, file_path: Path, desc: str) -> bool:
+        """
+        执行一次下载请求
+        
+        若存在未完成的文件及记录总大小的 .part 标记文件，则只请求剩余部分并追加写入。
+        下载完成后标记文件保留，直到临时文件被合并/重命名，中断后重跑时无需重新下载已完整的流。
+        网络错误直接抛出，由 download_file 负责重试。
+        """
+        part_path = self._resume_marker_path(file_path)
+        while True:
+            existing = 0
+            expected_total = 0
+            if await run_in_thread(part_path.exists) and await run_in_thread(file_path.exists):
+                try:
+                    expected_total = int((await run_in_thread(part_path.read_text)).strip())
+                except ValueError:
+                    expected_total = 0
+                existing = (await run_in_thread(file_path.stat)).st_size
+                if not expected_total or existing > expected_total:
+                    existing = 0  # 标记文件无效，重新下载
+            
+            headers = dict(HEADERS)
+            if existing:
+                headers['Range'] = f'bytes={existing}-'
+            
+            session = await self._get_session()
+            async with session.get(url, headers=headers) as response:
+                if existing and response.status == 206:
+                    # Content-Range: bytes start-end/total，总大小与记录不一致说明内容已变化
+                    content_range = response.headers.get('content-range', '')
+                    total_size = int(content_range.rsplit('/', 1)[-1]) if content_range.rsplit('/', 1)[-1].isdigit() else 0
+                    if total_size == expected_total:
+                        return await self._write_response(response, file_path, part_path, existing, total_size, desc)
+                    self.logger.warning(f"{desc}: 远端文件大小已变化，重新下载")
+                elif existing and response.status == 416:
+                    if (existing == expected_total
+                            and response.headers.get('content-range', f'*/{expected_total}').rsplit('/', 1)[-1] == str(expected_total)):
+                        # 文件已完整下载(416 的 Content-Range 为 bytes */总大小，与记录一致)
+                        return True
+                    # 远端文件已变小或内容已变化，请求范围失效
+                    self.logger.warning(f"{desc}: 远端文件大小已变化，重新下载")
+                elif response.status == 200:
+                    # 服务器忽略 Range 时直接用这次的完整响应从头覆盖写入，不再重复请求
+                    total_size = int(response.headers.get('content-length', 0))
+                    return await self._write_response(response, file_path, part_path, 0, total_size, desc)
+                else:
+                    self.logger.error(f"{desc}失败: HTTP {response.status}")
+                    return False
+            
+            # 续传失败：先释放本次响应占用的连接，丢弃旧数据后重新完整下载
+            await run_in_thread(part_path.unlink, missing_ok=True)
+            await run_in_thread(file_path.unlink, missing_ok=True)
+    
+    async def _write_response(self, response: aiohttp.ClientResponse, file_path: Path, part_path: Path,
+                              existing: int, total_size: int, desc: str) -> bool:
+        """将响应体写入文件：existing 大于0时追加到已有数据之后，否则从头覆盖"""
+        if total_size > 0:
+            await run_in_thread(part_path.write_text, str(total_size))
+        
+        written = existing
+        last_report = 0.0
+        progress_key = str(file_path)
+        report = self._progress_reporter(progress_key)
+        
+        # iter_any 直接交出已到达的数据，先累积到内存缓冲区，每满 WRITE_BUFFER_SIZE
+        # 才在线程池中直接写一次文件描述符；已下载字节数只在上报时由 written + 缓冲区长度得出
+        buffer = bytearray()
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0) | (os.O_APPEND if existing else os.O_TRUNC)
+        fd = await run_in_thread(os.open, file_path, flags, 0o644)
+        try:
+            async for chunk in response.content.iter_any():
+                buffer += chunk
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    await run_in_thread(self._write_all, fd, buffer)
+                    written += len(buffer)
+                    buffer.clear()
+                # 限制上报频率，避免每个分块都格式化并写入stdout
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    report(desc, written + len(buffer), total_size)
+            if buffer:
+                await run_in_thread(self._write_all, fd, buffer)
+                written += len(buffer)
+        finally:
+            await run_in_thread(os.close, fd)
+        downloaded = written
+        report(desc, downloaded, total_size)
+        if self._default_progress:
+            self._finish_progress(progress_key)
+        
+        if total_size > 0 and downloaded < total_size:
+            raise aiohttp.ClientPayloadError(f"连接提前结束 ({downloaded}/{total_size})")
+        
+        return True
+    
+    async def download_single_video(self, bvid: str, download_folder: Path, limiter: Optional[AdmissionController] = None, download_danmaku: bool = True,
+                                    meta: Optional[Dict] = None) -> bool:
         """
         下载单个视频
         
         Args:
             bvid: 视频BVID
             download_folder: 下载目录
-            semaphore: 并发控制信号量
+            limiter: 并发准入控制器(也可传入 asyncio.Semaphore)
             download_danmaku: 是否下载弹幕，默认True
+            meta: 列表接口已返回的视频信息(至少含title)，提供时可在请求视频详情前跳过已下载的视频
             
         Returns:
             下载成功返回True，失败返回False
         """
-        # 如果提供了信号量，使用它进行并发控制
-        if semaphore:
-            async with semaphore:
-                return await self._download_video_impl(bvid, download_folder, download_danmaku)
-        else:
-            return await self._download_video_impl(bvid, download_folder, download_danmaku)
+        downloaded = await self.download_video_files(bvid, download_folder, limiter, download_danmaku, meta)
+        return await self.finalize_video(bvid, downloaded)
+    
+    async def download_video_files(self, bvid: str, download_folder: Path, limiter: Optional[AdmissionController] = None,
+                                   download_danmaku: bool = True, meta: Optional[Dict] = None) -> bool:
+        """
+        下载视频的各分P文件（只有这一阶段占用并发槽位），合并任务入队后即返回
+        
+        之后须调用 finalize_video 等待合并并写入元数据。参数同 download_single_video。
+        
+        Returns:
+            下载阶段是否成功
+        """
+        # 如果提供了并发控制器，使用它进行并发控制
+        if limiter:
+            async with limiter:
+                return await self._download_video_impl(bvid, download_folder, download_danmaku, meta)
+        return await self._download_video_impl(bvid, download_folder, download_danmaku, meta)
+    
+    async def finalize_video(self, bvid: str, downloaded: bool) -> bool:
+        """
+        等待视频的后台合并完成，全部成功后写入元数据
+        
+        Args:
+            bvid: 视频BVID
+            downloaded: download_video_files 的返回值
+            
+        Returns:
+            视频整体是否下载成功
+        """
+        success = await self._wait_for_mux(bvid, downloaded)
+        
+        # 全部分P完成后才写入元数据，元数据文件同时作为下载完成的标记
+        pending_metadata = self._pending_metadata.pop(bvid, None)
+        if success and pending_metadata:
+            await self.save_video_metadata(*pending_metadata)
+        return success
     
     @api_retry_decorator()
     async def _get_download_url(self, v: video.Video) -> Dict:
         """获取视频下载链接"""
         return await v.get_download_url(0)
 
-    async def _download_video_impl(self, bvid: str, download_folder: Path, download_danmaku: bool = True) -> bool:
+    async def _download_video_impl(self, bvid: str, download_folder: Path, download_danmaku: bool = True,
+                                   meta: Optional[Dict] = None) -> bool:
         """下载视频的具体实现"""
         try:
-            # 获取视频信息
-            info = await self.get_video_info(bvid)
+            # 列表数据已包含标题时，先检查是否已下载，避免多余的详情请求
+            if meta and meta.get('title'):
+                video_folder_name = self.get_video_folder_name(meta['title'], bvid)
+                if await run_in_thread(self.is_video_folder_complete, download_folder / video_folder_name):
+                    print(f"视频文件夹已存在: {video_folder_name}")
+                    return True
+            
+            # 获取视频信息（同一个视频对象复用于分P、下载链接和弹幕请求）
+            v = video.Video(bvid=bvid, credential=self.credential)
+            info = await self.get_video_info(bvid, v)
             if not info:
                 print(f"无法获取视频信息: {bvid}")
                 return False
@@ -327,39 +749,47 @@ class VideoDownloader:
             video_folder_name = self.get_video_folder_name(title, bvid)
             video_folder = download_folder / video_folder_name
             
-            # 检查文件夹是否已存在
-            if video_folder.exists():
+            # 一次列出文件夹内容：元数据文件存在说明已下载完成；否则已完成的分P据此跳过，无需逐个stat
+            existing_files = await run_in_thread(self._list_folder, video_folder)
+            if METADATA_FILENAME in existing_files:
                 print(f"视频文件夹已存在: {video_folder_name}")
                 return True
             
-            video_folder.mkdir(parents=True, exist_ok=True)
-            print(f"📁 创建视频文件夹: {video_folder_name}")
+            if existing_files:
+                print(f"▶️  继续未完成的下载: {video_folder_name}")
+            else:
+                await run_in_thread(video_folder.mkdir, parents=True, exist_ok=True)
+                print(f"📁 创建视频文件夹: {video_folder_name}")
             
-            # 获取分P信息
-            v = video.Video(bvid=bvid, credential=self.credential)
-            pages = await v.get_pages()
+            # 获取分P信息（视频详情中已包含，缺失时再单独请求）
+            pages = info.get('pages') or await v.get_pages()
             
-            # 保存元数据
-            await self.save_video_metadata(info, pages, video_folder)
+            # 元数据在全部分P合并完成后写入(见 download_single_video)
+            self._pending_metadata[bvid] = (info, pages, video_folder)
             
             print(f"\n开始下载: {title}")
             print(f"分P数量: {len(pages)}")
             
-            # 下载每个分P
-            all_success = True
-            for i, page in enumerate(pages):
+            # 各分P相互独立，并发下载（限制同时下载的分P数，避免压垮同一CDN节点）
+            page_semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+            
+            async def download_page(i: int, page: dict) -> bool:
                 page_title = page.get('part', f'P{i+1}')
-                print(f"\n📹 下载 P{i+1:02d}: {page_title}")
-                
-                success = await self._download_single_page(v, i, page, page_title, video_folder, download_danmaku)
+                async with page_semaphore:
+                    print(f"\n📹 下载 P{i+1:02d}: {page_title}")
+                    success = await self._download_single_page(v, i, page, page_title, video_folder, download_danmaku,
+                                                               existing_files)
                 if not success:
-                    all_success = False
                     print(f"❌ P{i+1:02d} 下载失败")
                 else:
                     print(f"✅ P{i+1:02d} 下载完成")
+                return success
+            
+            results = await asyncio.gather(*(download_page(i, page) for i, page in enumerate(pages)))
+            all_success = all(results)
             
             if all_success:
-                print(f"🎉 视频下载完成: {title}")
+                print(f"📥 视频流下载完成: {title}")
                 return True
             else:
                 print(f"⚠️  部分分P下载失败: {title}")
@@ -370,26 +800,53 @@ class VideoDownloader:
             self.logger.error(f"视频下载失败: {e}")
             return False
     
-    async def _download_single_page(self, v: video.Video, page_index: int, page_info: dict, page_title: str, video_folder: Path, download_danmaku: bool = True) -> bool:
-        """下载单个分P视频和弹幕"""
+    async def _download_single_page(self, v: video.Video, page_index: int, page_info: dict, page_title: str, video_folder: Path, download_danmaku: bool = True,
+                                    existing_files: Optional[Set[str]] = None) -> bool:
+        """下载单个分P视频和弹幕（existing_files 为视频文件夹中已有的文件名，未提供时逐个检查）"""
+        danmaku_task = None
         try:
-            # 生成分P文件名
+            # 生成分P视频和弹幕文件名（标题只处理一次）
             safe_page_title = self._safe_filename_chars(page_title, 255)
             video_filename = f"P{page_index+1:02d}_{safe_page_title}.mp4"
+            danmaku_filename = f"P{page_index+1:02d}_{safe_page_title}_danmaku.jsonl"
             video_path = video_folder / video_filename
+            danmaku_path = video_folder / danmaku_filename
             
             # 检查视频文件是否已存在
-            if video_path.exists():
+            if existing_files is None:
+                existing_files = await run_in_thread(self._list_folder, video_folder)
+            if video_filename in existing_files:
                 print(f"分P视频已存在: {video_filename}")
                 # 如果视频存在但弹幕不存在，仍然下载弹幕
-                if download_danmaku:
-                    safe_page_title_danmaku = self._safe_filename_chars(page_title, 255)
-                    danmaku_filename = f"P{page_index+1:02d}_{safe_page_title_danmaku}_danmaku.jsonl"
-                    danmaku_path = video_folder / danmaku_filename
-                    if not danmaku_path.exists():
-                        await self._download_page_danmaku(v, page_index, page_title, video_folder)
+                if download_danmaku and danmaku_filename not in existing_files:
+                    await self._download_page_danmaku(v, page_index, page_title, danmaku_path)
                 return True
             
+            # 弹幕请求与视频下载互不依赖，提前发起，在视频下载期间完成
+            if download_danmaku:
+                danmaku_task = asyncio.ensure_future(self._fetch_page_danmaku(v, page_index, page_title))
+            
+            success = await self._download_page_media(v, page_index, video_folder, video_path)
+            
+            # 保存弹幕
+            if success and danmaku_task is not None:
+                danmakus, special_danmakus = await danmaku_task
+                await self.save_danmakus_to_jsonl(danmakus, special_danmakus, danmaku_path)
+            
+            return success
+            
+        except Exception as e:
+            print(f"❌ P{page_index+1} 下载失败: {e}")
+            self.logger.error(f"分P{page_index+1}下载失败: {e}")
+            return False
+        finally:
+            # 视频下载失败时不再需要弹幕
+            if danmaku_task is not None and not danmaku_task.done():
+                danmaku_task.cancel()
+    
+    async def _download_page_media(self, v: video.Video, page_index: int, video_folder: Path, video_path: Path) -> bool:
+        """下载单个分P的音视频流，需要转换/合并时放入后台合并队列"""
+        try:
             # 获取下载链接
             download_url_data = await v.get_download_url(page_index)
             if not download_url_data:
@@ -415,7 +872,7 @@ class VideoDownloader:
                 auth_status = "🔓 会员画质" if self.credential else "🔒 普通画质"
                 print(f"📺 P{page_index+1} 画质: {quality_name} ({auth_status})")
             
-            # 下载视频
+            # 下载视频（ffmpeg 处理交给后台合并队列，不占用下载并发槽位）
             success = False
             if detecter.check_flv_mp4_stream():
                 # FLV/MP4 流 - 直接下载
@@ -423,123 +880,74 @@ class VideoDownloader:
                 download_success = await self.download_file(streams[0].url, temp_file, f"P{page_index+1}")
                 
                 if download_success:
-                    # 使用 ffmpeg 转换格式
-                    ffmpeg_path = self.get_ffmpeg_path()
-                    if ffmpeg_path:
-                        try:
+                    # 该类流有时已是MP4(ISO-BMFF)容器，嗅探文件头，是则直接重命名，无需启动ffmpeg
+                    header = await run_in_thread(self._read_file_header, temp_file, 8)
+                    
+                    if header[4:8] == b'ftyp':
+                        await run_in_thread(temp_file.replace, video_path)
+                        await run_in_thread(self._resume_marker_path(temp_file).unlink, missing_ok=True)
+                        success = True
+                    else:
+                        # 使用 ffmpeg 转换格式
+                        ffmpeg_path = self.get_ffmpeg_path()
+                        if ffmpeg_path:
                             cmd_args = [
                                 ffmpeg_path,
-                                '-i', str(temp_file),
-                                '-c', 'copy',
-                                str(video_path),
-                                '-y'
+                                *FFMPEG_FLV_INPUT_ARGS, '-i', str(temp_file),
+                                *FFMPEG_OUTPUT_ARGS,
+                                '-y', str(self._partial_output_path(video_path))
                             ]
-                            
-                            result = subprocess.run(cmd_args, 
-                                                  capture_output=True, 
-                                                  text=True, 
-                                                  encoding='utf-8',
-                                                  errors='ignore',
-                                                  timeout=300)
-                            
-                            if result.returncode == 0:
-                                success = True
-                            else:
-                                self.logger.error(f"P{page_index+1} FFmpeg格式转换失败:")
-                                self.logger.error(f"返回码: {result.returncode}")
-                                self.logger.error(f"stderr: {result.stderr}")
-                                self.logger.error(f"stdout: {result.stdout}")
-                                print(f"❌ P{page_index+1:02d} FFmpeg格式转换失败 (返回码: {result.returncode})")
-                                success = False
-                                
-                        except subprocess.TimeoutExpired:
-                            self.logger.error(f"P{page_index+1} FFmpeg转换超时")
-                            print(f"❌ P{page_index+1:02d} FFmpeg转换超时")
-                            success = False
-                        except Exception as e:
-                            self.logger.error(f"P{page_index+1} FFmpeg转换错误: {e}")
-                            print(f"❌ P{page_index+1:02d} FFmpeg转换错误: {e}")
+                            await self._enqueue_mux(v.get_bvid(), cmd_args, [temp_file], f"P{page_index+1:02d}", "FFmpeg格式转换",
+                                                    video_path)
+                            success = True
+                        else:
+                            print(f"❌ 未找到ffmpeg，无法转换视频格式")
                             success = False
-                        finally:
-                            temp_file.unlink(missing_ok=True)
-                    else:
-                        print(f"❌ 未找到ffmpeg，无法转换视频格式")
-                        success = False
+            elif self.pipe_mux:
+                # DASH 流 - 边下载边通过管道合并，不写临时文件
+                success = await self._download_page_piped(streams, video_path, page_index)
             else:
                 # DASH 流 - 音视频分离
                 video_temp = video_folder / f"temp_video_P{page_index+1:02d}.m4s"
                 audio_temp = video_folder / f"temp_audio_P{page_index+1:02d}.m4s"
                 
-                # 下载视频流和音频流
-                video_success = await self.download_file(streams[0].url, video_temp, f"P{page_index+1} 视频流")
-                if video_success and len(streams) > 1:
-                    audio_success = await self.download_file(streams[1].url, audio_temp, f"P{page_index+1} 音频流")
-                else:
-                    audio_success = True  # 只有视频流的情况
+                # 视频流和音频流是两个独立请求，同时下载
+                downloads = [self.download_file(streams[0].url, video_temp, f"P{page_index+1} 视频流")]
+                if len(streams) > 1:
+                    downloads.append(self.download_file(streams[1].url, audio_temp, f"P{page_index+1} 音频流"))
+                results = await asyncio.gather(*downloads)
+                video_success = results[0]
+                audio_success = results[1] if len(results) > 1 else True  # 只有视频流的情况
                 
                 if video_success:
                     # 使用 ffmpeg 合并音视频
                     ffmpeg_path = self.get_ffmpeg_path()
                     
                     if ffmpeg_path:
-                        try:
-                            if len(streams) > 1 and audio_success:
-                                # 合并音视频流
-                                cmd_args = [
-                                    ffmpeg_path,
-                                    '-i', str(video_temp),
-                                    '-i', str(audio_temp),
-                                    '-c', 'copy',
-                                    str(video_path),
-                                    '-y'
-                                ]
-                            else:
-                                # 只有视频流
-                                cmd_args = [
-                                    ffmpeg_path,
-                                    '-i', str(video_temp),
-                                    '-c', 'copy',
-                                    str(video_path),
-                                    '-y'
-                                ]
-                            
-                            result = subprocess.run(cmd_args, 
-                                                  capture_output=True, 
-                                                  text=True, 
-                                                  encoding='utf-8',
-                                                  errors='ignore',
-                                                  timeout=300)
-                            
-                            if result.returncode == 0:
-                                success = True
-                            else:
-                                self.logger.error(f"P{page_index+1} FFmpeg合并失败:")
-                                self.logger.error(f"返回码: {result.returncode}")
-                                self.logger.error(f"stderr: {result.stderr}")
-                                self.logger.error(f"stdout: {result.stdout}")
-                                print(f"❌ P{page_index+1:02d} FFmpeg合并失败 (返回码: {result.returncode})")
-                                success = False
-                                
-                        except subprocess.TimeoutExpired:
-                            self.logger.error(f"P{page_index+1} FFmpeg超时")
-                            print(f"❌ P{page_index+1:02d} FFmpeg处理超时")
-                            success = False
-                        except Exception as e:
-                            self.logger.error(f"P{page_index+1} FFmpeg执行错误: {e}")
-                            print(f"❌ P{page_index+1:02d} FFmpeg执行错误: {e}")
-                            success = False
-                        finally:
-                            # 清理临时文件
-                            video_temp.unlink(missing_ok=True)
-                            audio_temp.unlink(missing_ok=True)
+                        if len(streams) > 1 and audio_success:
+                            # 合并音视频流
+                            cmd_args = [
+                                ffmpeg_path,
+                                *FFMPEG_DASH_INPUT_ARGS, '-i', str(video_temp),
+                                *FFMPEG_DASH_INPUT_ARGS, '-i', str(audio_temp),
+                                *FFMPEG_OUTPUT_ARGS,
+                                '-y', str(self._partial_output_path(video_path))
+                            ]
+                        else:
+                            # 只有视频流
+                            cmd_args = [
+                                ffmpeg_path,
+                                *FFMPEG_DASH_INPUT_ARGS, '-i', str(video_temp),
+                                *FFMPEG_OUTPUT_ARGS,
+                                '-y', str(self._partial_output_path(video_path))
+                            ]
+                        await self._enqueue_mux(v.get_bvid(), cmd_args, [video_temp, audio_temp], f"P{page_index+1:02d}", "FFmpeg合并",
+                                                video_path)
+                        success = True
                     else:
                         print(f"❌ 未找到ffmpeg，无法合并音视频")
                         success = False
             
-            # 下载弹幕
-            if success and download_danmaku:
-                await self._download_page_danmaku(v, page_index, page_title, video_folder)
-            
             return success
             
         except Exception as e:
@@ -547,24 +955,134 @@ class VideoDownloader:
             self.logger.error(f"分P{page_index+1}下载失败: {e}")
             return False
     
-    async def _download_page_danmaku(self, v: video.Video, page_index: int, page_title: str, video_folder: Path):
-        """下载单个分P的弹幕"""
+    async def _download_page_piped(self, streams: list, video_path: Path, page_index: int) -> bool:
+        """
+        DASH 音视频流边下载边经管道送入ffmpeg合并
+        
+        省去临时 m4s 文件的写入和回读；代价是下载期间 ffmpeg 进程一直存在，
+        且中断后只能整页重新下载。
+        """
+        ffmpeg_path = self.get_ffmpeg_path()
+        if not ffmpeg_path:
+            print(f"❌ 未找到ffmpeg，无法合并音视频")
+            return False
+        
+        sources = [(stream.url, f"P{page_index+1} {name}")
+                   for stream, name in zip(streams, ("视频流", "音频流")) if stream is not None]
+        # ffmpeg 进程贯穿整个下载过程，全程占用合并并发名额，与临时文件合并共用CPU上限
+        async with self.mux_semaphore:
+            pipes = [os.pipe() for _ in sources]
+            read_fds = [read_fd for read_fd, _ in pipes]
+        
+            # ffmpeg 通过 pipe:N 直接读取继承的文件描述符
+            cmd_args = [ffmpeg_path]
+            for read_fd in read_fds:
+                cmd_args += [*FFMPEG_PIPE_INPUT_ARGS, '-i', f'pipe:{read_fd}']
+            partial_path = self._partial_output_path(video_path)
+            cmd_args += [*FFMPEG_OUTPUT_ARGS, '-y', str(partial_path)]
+        
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd_args,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                    pass_fds=read_fds
+                )
+            except Exception:
+                for _, write_fd in pipes:
+                    os.close(write_fd)
+                raise
+            finally:
+                # 读端已由子进程继承，父进程关闭自己的副本
+                for read_fd in read_fds:
+                    os.close(read_fd)
+        
+            stderr_task = asyncio.ensure_future(proc.stderr.read())
+            try:
+                results = await asyncio.gather(*(
+                    self._stream_to_pipe(url, write_fd, desc, f"{partial_path}|{desc}")
+                    for (url, desc), (_, write_fd) in zip(sources, pipes)
+                ))
+                stderr = await stderr_task
+                await proc.wait()
+            except BaseException:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+                stderr_task.cancel()
+                raise
+        
+        if all(results) and proc.returncode == 0:
+            await run_in_thread(partial_path.replace, video_path)
+            return True
+        
+        if proc.returncode != 0:
+            error_msg = stderr.decode('utf-8', errors='ignore')
+            print(f"❌ FFmpeg管道合并失败")
+            self.logger.error(f"P{page_index+1:02d} FFmpeg管道合并失败: {error_msg}")
+        # 输入流不完整时ffmpeg也可能正常退出，输出文件不可信，删除以便下次重新下载
+        await run_in_thread(partial_path.unlink, missing_ok=True)
+        return False
+    
+    async def _stream_to_pipe(self, url: str, write_fd: int, desc: str, progress_key: str) -> bool:
+        """下载流并写入管道写端，结束时关闭写端使ffmpeg读到EOF（progress_key 区分各下载的进度）"""
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin,
+                                                            os.fdopen(write_fd, 'wb', buffering=0))
+        writer = asyncio.StreamWriter(transport, protocol, None, loop)
+        try:
+            session = await self._get_session()
+            async with session.get(url, headers=HEADERS) as response:
+                if response.status != 200:
+                    self.logger.error(f"{desc}失败: HTTP {response.status}")
+                    return False
+                
+                total_size = int(response.headers.get('content-length', 0))
+                downloaded = 0
+                last_report = 0.0
+                report = self._progress_reporter(progress_key)
+                
+                async for chunk in response.content.iter_any():
+                    writer.write(chunk)
+                    # 等待ffmpeg消费，管道缓冲区不会无限增长
+                    await writer.drain()
+                    downloaded += len(chunk)
+                    now = time.monotonic()
+                    if now - last_report >= PROGRESS_INTERVAL:
+                        last_report = now
+                        report(desc, downloaded, total_size)
+                report(desc, downloaded, total_size)
+                if self._default_progress:
+                    self._finish_progress(progress_key)
+                
+                return total_size == 0 or downloaded >= total_size
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            # ffmpeg 提前退出时写入会触发 BrokenPipeError
+            self.logger.error(f"{desc}出错: {e}")
+            return False
+        finally:
+            writer.close()
+            self._active_progress.pop(progress_key, None)
+    
+    async def _download_page_danmaku(self, v: video.Video, page_index: int, page_title: str, danmaku_path: Path):
+        """下载单个分P的弹幕并保存到 danmaku_path"""
+        danmakus, special_danmakus = await self._fetch_page_danmaku(v, page_index, page_title)
+        await self.save_danmakus_to_jsonl(danmakus, special_danmakus, danmaku_path)
+    
+    async def _fetch_page_danmaku(self, v: video.Video, page_index: int, page_title: str) -> Tuple[List[Danmaku], List[SpecialDanmaku]]:
+        """获取单个分P的普通弹幕和特殊弹幕，失败时返回空列表"""
         try:
             print(f"📝 下载P{page_index+1}弹幕: {page_title}")
-            
-            danmakus = await self.get_video_danmakus(v, page_index)
-            special_danmakus = await self.get_video_special_danmakus(v, page_index)
-            
-            # 生成弹幕文件名
-            safe_page_title = self._safe_filename_chars(page_title, 255)
-            danmaku_filename = f"P{page_index+1:02d}_{safe_page_title}_danmaku.jsonl"
-            danmaku_path = video_folder / danmaku_filename
-            
-            await self.save_danmakus_to_jsonl(danmakus, special_danmakus, danmaku_path)
-            
+            danmakus, special_danmakus = await asyncio.gather(
+                self.get_video_danmakus(v, page_index),
+                self.get_video_special_danmakus(v, page_index)
+            )
+            return danmakus or [], special_danmakus or []
         except Exception as e:
             print(f"⚠️  P{page_index+1}弹幕下载失败: {e}")
             self.logger.error(f"P{page_index+1}弹幕下载失败: {e}")
+            return [], []
     
     @api_retry_decorator()
     async def get_video_danmakus(self, v: video.Video, page_index: int = 0) -> List[Danmaku]:
@@ -580,7 +1098,8 @@ class VideoDownloader:
         """
         try:
             danmakus = await v.get_danmakus(page_index=page_index)
-            self.logger.info(f"获取到 {len(danmakus)} 条普通弹幕")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"获取到 {len(danmakus)} 条普通弹幕")
             return danmakus
         except DanmakuClosedException:
             self.logger.warning("该视频弹幕已关闭")
@@ -603,7 +1122,8 @@ class VideoDownloader:
         """
         try:
             special_danmakus = await v.get_special_dms(page_index=page_index)
-            self.logger.info(f"获取到 {len(special_danmakus)} 条特殊弹幕")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"获取到 {len(special_danmakus)} 条特殊弹幕")
             return special_danmakus
         except Exception as e:
             self.logger.error(f"获取特殊弹幕失败: {e}")
@@ -628,20 +1148,20 @@ class VideoDownloader:
                 self.logger.info("无弹幕可保存")
                 return True
             
-            async with aiofiles.open(save_path, 'w', encoding='utf-8') as f:
-                # 保存普通弹幕 - 使用vars()保存完整对象信息
-                for dm in danmakus:
-                    danmaku_data = vars(dm).copy()  # 获取对象的所有属性
-                    danmaku_data['type'] = 'regular'  # 添加类型标识
-                    await f.write(json.dumps(danmaku_data, ensure_ascii=False) + '\n')
-                
-                # 保存特殊弹幕 - 使用vars()保存完整对象信息
-                for sdm in special_danmakus:
-                    special_data = vars(sdm).copy()  # 获取对象的所有属性
-                    special_data['type'] = 'special'  # 添加类型标识
-                    await f.write(json.dumps(special_data, ensure_ascii=False) + '\n')
+            # 使用 orjson 直接序列化为UTF-8字节，拼接后一次性写入文件
+            dumps = orjson.dumps
+            option = orjson.OPT_APPEND_NEWLINE
+            lines = []
+            # 保存普通弹幕 - 使用vars()保存完整对象信息，合并时一并添加类型标识
+            lines.extend(dumps({**vars(dm), 'type': 'regular'}, default=str, option=option) for dm in danmakus)
+            
+            # 保存特殊弹幕 - 使用vars()保存完整对象信息
+            lines.extend(dumps({**vars(sdm), 'type': 'special'}, default=str, option=option) for sdm in special_danmakus)
+            
+            await run_in_thread(save_path.write_bytes, b''.join(lines))
             
-            self.logger.info(f"弹幕保存成功: {save_path.name} ({total_count} 条)")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"弹幕保存成功: {save_path.name} ({total_count} 条)")
             return True
             
         except Exception as e:
@@ -674,21 +1194,127 @@ class VideoDownloader:
         else:
             return "/dev/null"
 
-    def check_ffmpeg(self) -> bool:
-        """检查系统是否安装了ffmpeg"""
+    async def _run_ffmpeg(self, cmd_args: List[str], timeout: float = 300) -> Tuple[int, str]:
+        """
+        以子进程方式异步运行ffmpeg，不阻塞事件循环
+        
+        Args:
+            cmd_args: 完整命令参数(不经过shell)
+            timeout: 超时时间(秒)，超时后终止进程并抛出 asyncio.TimeoutError；
+                     协程被取消时同样会终止进程
+            
+        Returns:
+            (返回码, stderr输出)
+        """
+        async with self.mux_semaphore:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd_args,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # 超时或任务被取消(如 aclose)时终止ffmpeg，避免遗留子进程
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+                raise
+        return proc.returncode, stderr.decode('utf-8', errors='ignore')
+
+    async def _enqueue_mux(self, bvid: str, cmd_args: List[str], temp_files: List[Path], label: str, action: str,
+                           video_path: Path) -> asyncio.Future:
+        """
+        将ffmpeg任务放入后台合并队列
+        
+        Args:
+            bvid: 所属视频BVID，用于 download_single_video 等待该视频的全部合并任务
+            cmd_args: ffmpeg命令参数(输出到 _partial_output_path(video_path))
+            temp_files: 合并完成后需要清理的临时文件
+            label: 日志中的分P标识(如 P01)
+            action: 日志中的操作名称
+            video_path: 最终视频路径，合并成功后由临时输出重命名而来
+            
+        Returns:
+            合并完成后结果为 True/False 的 Future
+        """
+        if self._mux_queue is None:
+            self._mux_queue = asyncio.Queue()
+            self._mux_workers = [asyncio.ensure_future(self._mux_worker()) for _ in range(self.mux_concurrency)]
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending_mux.setdefault(bvid, []).append(future)
+        await self._mux_queue.put((cmd_args, temp_files, label, action, video_path, future))
+        return future
+    
+    async def _mux_worker(self) -> None:
+        """后台ffmpeg工作协程：从合并队列取任务执行，结果写入对应的 Future"""
+        while True:
+            cmd_args, temp_files, label, action, video_path, future = await self._mux_queue.get()
+            partial_path = self._partial_output_path(video_path)
+            success = False
+            cancelled = False
+            try:
+                returncode, stderr = await self._run_ffmpeg(cmd_args)
+                
+                if returncode == 0:
+                    await run_in_thread(partial_path.replace, video_path)
+                    success = True
+                else:
+                    self.logger.error(f"{label} {action}失败:")
+                    self.logger.error(f"返回码: {returncode}")
+                    self.logger.error(f"stderr: {stderr}")
+                    print(f"❌ {label} {action}失败 (返回码: {returncode})")
+                    
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            except asyncio.TimeoutError:
+                self.logger.error(f"{label} {action}超时")
+                print(f"❌ {label} {action}超时")
+            except Exception as e:
+                self.logger.error(f"{label} {action}错误: {e}")
+                print(f"❌ {label} {action}错误: {e}")
+            finally:
+                if not success:
+                    await run_in_thread(partial_path.unlink, missing_ok=True)
+                # 清理临时文件；被取消(如 aclose)时保留，下次运行可直接复用已下载的流
+                if not cancelled:
+                    await self._remove_temp_files(temp_files)
+                if not future.done():
+                    future.set_result(success)
+                self._mux_queue.task_done()
+    
+    async def _wait_for_mux(self, bvid: str, downloaded: bool) -> bool:
+        """等待视频的全部后台合并任务完成，返回整体是否成功"""
+        futures = self._pending_mux.pop(bvid, [])
+        if not futures:
+            return downloaded
+        
+        results = await asyncio.gather(*futures)
+        if downloaded and all(results):
+            print(f"🎉 视频下载完成: {bvid}")
+            return True
+        
+        print(f"⚠️  部分分P处理失败: {bvid}")
+        return False
+
+    async def check_ffmpeg(self) -> bool:
+        """检查系统是否安装了ffmpeg（结果缓存，多次批量下载只启动一次子进程）"""
+        if self._ffmpeg_available is None:
+            self._ffmpeg_available = await self._probe_ffmpeg()
+        return self._ffmpeg_available
+    
+    async def _probe_ffmpeg(self) -> bool:
+        """运行 ffmpeg -version 检测是否可用"""
         ffmpeg_path = self.get_ffmpeg_path()
         if not ffmpeg_path:
             return False
         
         try:
-            result = subprocess.run([ffmpeg_path, '-version'], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  encoding='utf-8',
-                                  errors='ignore',
-                                  timeout=10)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
+            returncode, _ = await self._run_ffmpeg([ffmpeg_path, '-version'], timeout=10)
+            return returncode == 0
+        except (asyncio.TimeoutError, OSError):
             return False
 
 
@@ -696,7 +1322,8 @@ class BilibiliVideoManager:
     """Bilibili视频管理器 - 整合视频、用户、合集相关功能"""
     
     def __init__(self, download_dir: str = "downloads", max_concurrent: int = 1, 
-                 credential: Optional[Credential] = None, preferred_quality: str = "auto", log_file: str = "logs.txt"):
+                 credential: Optional[Credential] = None, preferred_quality: str = "auto", log_file: str = "logs.txt",
+                 pipe_mux: bool = False):
         """
         初始化管理器
         
@@ -706,16 +1333,53 @@ class BilibiliVideoManager:
             credential: B站登录凭据(用于高画质下载)
             preferred_quality: 首选画质(auto/1080p60/4k/8k等)
             log_file: 日志文件路径
+            pipe_mux: DASH音视频流经管道直接合并，不写临时文件
         """
         self.download_dir = Path(download_dir)
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # 下载并发准入控制，可在运行中通过 set_max_concurrent 调整
+        self.admission = AdmissionController(max_concurrent)
+        # 下载中与已下载待合并的视频总数上限：每个下载槽位之外再允许一个视频等待合并，
+        # 合并跟不上时不会在磁盘上无限堆积临时流文件
+        self.mux_backlog = AdmissionController(max_concurrent * 2)
+        # ffmpeg 合并/转封装按CPU核数单独限流，与下载并发互不影响
+        self.mux_semaphore = asyncio.Semaphore(os.cpu_count() or 4)
         self.credential = credential
         
         # 创建视频下载器
-        self.downloader = VideoDownloader(credential=credential, preferred_quality=preferred_quality, log_file=log_file)
+        self.downloader = VideoDownloader(credential=credential, preferred_quality=preferred_quality, log_file=log_file,
+                                          max_concurrent=max_concurrent, mux_semaphore=self.mux_semaphore,
+                                          pipe_mux=pipe_mux)
         # 使用统一的日志配置
         self.logger = get_logger('VideoManager', log_file)
+        
+        # 合集ID -> (合集类型, 合集对象)，避免重复检测合集类型
+        self._collection_cache: Dict[int, Tuple[str, ChannelSeries]] = {}
+        # (合集ID, 合集类型) -> 合集元数据，重复解析同一合集时免去 get_meta 请求
+        self._collection_meta_cache: Dict[Tuple[int, str], Dict] = {}
+        # (合集ID, 合集类型) -> 合集对象，自动检测的两次探测与后续下载复用同一实例
+        self._channel_series_cache: Dict[Tuple[int, ChannelSeriesType], ChannelSeries] = {}
+        # (合集ID, 合集类型) -> 类型探测时取得的第一页数据，只保存被采用的探测结果
+        self._probed_first_pages: Dict[Tuple[int, ChannelSeriesType], Dict] = {}
+        # 已创建的目录，避免重复 mkdir
+        self._created_dirs: Set[Path] = set()
+    
+    async def __aenter__(self) -> "BilibiliVideoManager":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """释放下载器持有的HTTP会话及后台合并协程（批量下载之间共享，只在管理器关闭时释放）"""
+        await self.downloader.aclose()
+    
+    async def set_max_concurrent(self, max_concurrent: int) -> None:
+        """运行中调整最大并发下载数"""
+        self.max_concurrent = max_concurrent
+        await self.admission.set_limit(max_concurrent)
+        await self.mux_backlog.set_limit(max_concurrent * 2)
+        self.logger.info(f"最大并发下载数已调整为 {self.admission.limit}")
     
     @api_retry_decorator()
     async def get_user_info(self, uid: int) -> Dict:
@@ -728,29 +1392,33 @@ class BilibiliVideoManager:
             self.logger.error(f"获取用户信息失败: {e}")
             return {}
     
-    def create_download_folder(self, user_info: Dict, uid: int) -> Path:
-        """创建下载文件夹"""
+    def _user_folder_path(self, user_info: Dict, uid: int) -> Path:
+        """生成用户下载文件夹路径（不创建）"""
         if user_info:
             username = user_info.get('name', f'UID_{uid}')
         else:
             username = f'UID_{uid}'
             
         # 清理文件名中的非法字符
-        username = "".join(c for c in username if c.isalnum() or c in (' ', '-', '_')).strip()
-        
-        user_folder = self.download_dir / f"{username}_{uid}"
-        user_folder.mkdir(parents=True, exist_ok=True)
+        username = _UNSAFE_USERNAME_RE.sub('', username).strip()
         
-        return user_folder
+        return self.download_dir / f"{username}_{uid}"
+    
+    async def _ensure_dir(self, folder: Path) -> None:
+        """创建目录（含父目录），同一目录在本管理器生命周期内只创建一次"""
+        if folder in self._created_dirs:
+            return
+        await run_in_thread(folder.mkdir, parents=True, exist_ok=True)
+        self._created_dirs.add(folder)
     
     async def download_single_video(self, bvid: str, download_folder: Path = None, download_danmaku: bool = True) -> bool:
         """下载单个视频"""
         if download_folder is None:
             download_folder = self.download_dir / "single_videos"
-            download_folder.mkdir(parents=True, exist_ok=True)
+            await self._ensure_dir(download_folder)
         
         # 检查ffmpeg
-        if not self.downloader.check_ffmpeg():
+        if not await self.downloader.check_ffmpeg():
             print("⚠️  警告: 未找到 ffmpeg，可能无法正确处理某些视频")
             print("请安装 ffmpeg: https://ffmpeg.org/")
         
@@ -759,39 +1427,38 @@ class BilibiliVideoManager:
     @api_retry_decorator()
     async def _get_videos_page(self, user_obj: user.User, page: int) -> Dict:
         """获取一页用户视频"""
-        return await user_obj.get_videos(pn=page, ps=30)
+        return await user_obj.get_videos(pn=page, ps=USER_VIDEOS_PAGE_SIZE)
 
     async def list_user_videos_data(self, uid: int) -> List[Dict]:
         """获取用户所有投稿视频数据"""
         user_obj = user.User(uid, credential=self.credential)
         all_videos = []
-        page = 1
         
         self.logger.info(f"正在获取用户 {uid} 的视频列表...")
         
-        while True:
-            try:
-                videos_data = await self._get_videos_page(user_obj, page)
-                if not videos_data:
-                    break
-
-                videos = videos_data.get('list', {}).get('vlist', [])
-                
-                if not videos:
-                    break
-                    
-                all_videos.extend(videos)
-                
-                # 检查是否还有更多页
-                if len(videos) < 30:
-                    break
-                    
-                page += 1
-                await asyncio.sleep(0.5)  # 避免请求过快
+        try:
+            # 第一页返回视频总数，据此并发获取剩余分页
+            videos_data = await self._get_videos_page(user_obj, 1)
+            if not videos_data:
+                return all_videos
+            
+            all_videos.extend(videos_data.get('list', {}).get('vlist', []))
+            
+            count = videos_data.get('page', {}).get('count', 0)
+            total_pages = math.ceil(count / USER_VIDEOS_PAGE_SIZE)
+            if total_pages > 1:
+                pages = await gather_limited(
+                    PAGE_FETCH_CONCURRENCY,
+                    *(self._get_videos_page(user_obj, page) for page in range(2, total_pages + 1))
+                )
+                for page, videos_data in enumerate(pages, 2):
+                    if not videos_data:
+                        self.logger.error(f"获取第{page}页视频列表失败")
+                        continue
+                    all_videos.extend(videos_data.get('list', {}).get('vlist', []))
                 
-            except Exception as e:
-                self.logger.error(f"获取第{page}页视频列表失败: {e}")
-                break
+        except Exception as e:
+            self.logger.error(f"获取视频列表失败: {e}")
         
         return all_videos
     
@@ -836,12 +1503,9 @@ class BilibiliVideoManager:
         username = user_info.get('name', 'Unknown')
         print(f"\n开始下载用户 {username} (UID: {uid}) 的视频")
         
-        # 创建用户根目录
-        user_folder = self.create_download_folder(user_info, uid)
-        
-        # 创建videos子文件夹用于存储视频
-        videos_folder = user_folder / "videos"
-        videos_folder.mkdir(parents=True, exist_ok=True)
+        # 用户根目录下的videos子文件夹用于存储视频，一次mkdir同时创建两级目录
+        videos_folder = self._user_folder_path(user_info, uid) / "videos"
+        await self._ensure_dir(videos_folder)
         
         print(f"下载目录: {videos_folder}")
         
@@ -853,69 +1517,167 @@ class BilibiliVideoManager:
         
         print(f"\n共找到 {len(all_videos)} 个视频，开始批量下载...")
         
-        success_count = 0
-        failed_count = 0
-        
         # 检查ffmpeg
-        if not self.downloader.check_ffmpeg():
+        if not await self.downloader.check_ffmpeg():
             print("⚠️  警告: 未找到 ffmpeg，可能无法正确处理某些视频")
             print("请安装 ffmpeg: https://ffmpeg.org/")
         
-        # 创建下载任务
-        tasks = []
-        for video_info in all_videos:
-            task = self.downloader.download_single_video(video_info['bvid'], videos_folder, self.semaphore, download_danmaku)
-            tasks.append(task)
-        
         # 执行下载
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        videos = [(video_info['bvid'], video_info['title']) for video_info in all_videos]
+        success_count, failed_count = await self._download_videos(videos, videos_folder, download_danmaku)
         
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                print(f"❌ 视频下载异常 {all_videos[i]['title']}: {result}")
-                failed_count += 1
-            elif result:
+        print(f"\n📊 下载完成！成功: {success_count}, 失败: {failed_count}")
+    
+    async def _download_videos(self, videos: List[Tuple[str, str]], download_folder: Path, download_danmaku: bool = True) -> Tuple[int, int]:
+        """
+        批量下载视频：有界队列 + 固定数量的工作协程
+        
+        工作协程数固定，内存占用不随视频数量增长；同时下载的视频数由 admission 控制，可在运行中调整。
+        视频下载完成后合并在后台等待，工作协程立即开始下一个视频，每个视频完成后立即输出进度。
+        
+        Args:
+            videos: (BVID, 标题) 列表
+            download_folder: 下载目录
+            download_danmaku: 是否下载弹幕
+            
+        Returns:
+            (成功数, 失败数)
+        """
+        # 一次列出目录中已完成的视频文件夹，直接跳过，无需逐个请求视频详情
+        existing = await run_in_thread(self.downloader.list_completed_video_folders, download_folder)
+        pending = []
+        skipped = 0
+        for bvid, title in videos:
+            if self.downloader.get_video_folder_name(title, bvid) in existing:
+                skipped += 1
+            else:
+                pending.append((bvid, title))
+        if skipped:
+            print(f"⏭️  跳过 {skipped} 个已下载的视频")
+        if not pending:
+            return skipped, 0
+        videos = pending
+        
+        total = len(videos)
+        # 工作协程数按上限创建，实际同时下载数由 admission 控制，
+        # 运行中通过 set_max_concurrent 调大上限时已有空闲协程可以立即开始下载
+        worker_count = max(1, min(max(self.admission.limit, BATCH_WORKERS), total))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count * 2)
+        finalizers: Set[asyncio.Task] = set()
+        success_count = 0
+        failed_count = 0
+        
+        async def producer():
+            for item in videos:
+                await queue.put(item)
+            # 每个工作协程一个结束标记
+            for _ in range(worker_count):
+                await queue.put(None)
+        
+        def record(result: bool) -> None:
+            nonlocal success_count, failed_count
+            if result:
                 success_count += 1
             else:
                 failed_count += 1
+            print(f"📈 进度: {success_count + failed_count}/{total} (成功: {success_count}, 失败: {failed_count})")
         
-        print(f"\n📊 下载完成！成功: {success_count}, 失败: {failed_count}")
+        async def finalize(bvid: str, title: str, downloaded: bool):
+            try:
+                result = await self.downloader.finalize_video(bvid, downloaded)
+            except Exception as e:
+                print(f"❌ 视频下载异常 {title}: {e}")
+                result = False
+            finally:
+                # 合并结束（含失败/取消）后临时文件已处理，释放积压名额
+                await self.mux_backlog.release()
+            record(result)
+        
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                bvid, title = item
+                # 开始下载前占用积压名额，直到该视频合并完成才释放
+                await self.mux_backlog.acquire()
+                try:
+                    downloaded = await self.downloader.download_video_files(bvid, download_folder, self.admission,
+                                                                            download_danmaku, meta={'title': title})
+                except BaseException as e:
+                    await self.mux_backlog.release()
+                    if not isinstance(e, Exception):
+                        raise
+                    print(f"❌ 视频下载异常 {title}: {e}")
+                    record(False)
+                    continue
+                # 等待合并交给后台任务，下载槽位释放后本协程立即处理下一个视频
+                task = asyncio.ensure_future(finalize(bvid, title, downloaded))
+                finalizers.add(task)
+                task.add_done_callback(finalizers.discard)
+        
+        try:
+            await asyncio.gather(producer(), *(worker() for _ in range(worker_count)))
+            while finalizers:
+                await asyncio.gather(*finalizers)
+        finally:
+            for task in finalizers:
+                task.cancel()
+        return success_count + skipped, failed_count
     
     # 合集相关方法
     
-    @api_retry_decorator()
+    @api_retry_decorator(max_retries=4, initial_wait_time=1)
     async def _get_collection_meta(self, collection: ChannelSeries) -> Dict:
         """获取合集元数据"""
         return await collection.get_meta()
 
+    async def _get_collection_info(self, collection: ChannelSeries) -> Optional[Dict]:
+        """获取单个合集的展示信息，失败时返回None"""
+        try:
+            meta = await self._get_collection_meta(collection)
+            if not meta:
+                return None
+            
+            # 记下合集类型与元数据，之后解析同一合集时无需再探测类型
+            collection_type = 'season' if collection.is_new else 'series'
+            # SEASON 与 SERIES 的ID可能重合，与自动检测一致优先保留 SEASON
+            if collection_type == 'season' or collection.id_ not in self._collection_cache:
+                self._collection_cache[collection.id_] = (collection_type, collection)
+            self._collection_meta_cache[(collection.id_, collection_type)] = meta
+            series_type = ChannelSeriesType.SEASON if collection.is_new else ChannelSeriesType.SERIES
+            self._channel_series_cache.setdefault((collection.id_, series_type), collection)
+
+            return {
+                'id': collection.id_,
+                'type': collection_type,
+                'name': meta.get('name', meta.get('title', 'Unknown')),
+                'description': meta.get('description', meta.get('intro', '')),
+                'total': self._meta_total(meta),
+                'cover': meta.get('cover', ''),
+                'created_time': meta.get('ctime', 0)
+            }
+        except Exception as e:
+            self.logger.warning(f"获取合集 {collection.id_} 信息失败: {e}")
+            return None
+
+    @staticmethod
+    def _meta_total(meta: Dict) -> int:
+        """从合集元数据中读取视频总数"""
+        return meta.get('total', meta.get('ep_count', 0)) or 0
+
     async def get_user_collections_data(self, uid: int) -> List[Dict]:
         """获取用户所有合集"""
         try:
             user_obj = user.User(uid, credential=self.credential)
             collections = await user_obj.get_channels()
             
-            collection_list = []
-            for collection in collections:
-                try:
-                    meta = await self._get_collection_meta(collection)
-                    if not meta:
-                        continue
-
-                    collection_info = {
-                        'id': collection.id_,
-                        'type': 'season' if collection.is_new else 'series',
-                        'name': meta.get('name', meta.get('title', 'Unknown')),
-                        'description': meta.get('description', meta.get('intro', '')),
-                        'total': meta.get('total', meta.get('ep_count', 0)),
-                        'cover': meta.get('cover', ''),
-                        'created_time': meta.get('ctime', 0)
-                    }
-                    collection_list.append(collection_info)
-                    await asyncio.sleep(0.1)  # 避免请求过快
-                except Exception as e:
-                    self.logger.warning(f"获取合集 {collection.id_} 信息失败: {e}")
-            
-            return collection_list
+            # 并发获取各合集元数据，结果保持原有顺序
+            collection_infos = await gather_limited(
+                COLLECTION_META_CONCURRENCY,
+                *(self._get_collection_info(collection) for collection in collections)
+            )
+            return [info for info in collection_infos if info]
         except Exception as e:
             self.logger.error(f"获取用户合集失败: {e}")
             return []
@@ -929,221 +1691,247 @@ class BilibiliVideoManager:
             ps=page_size
         )
 
-    async def get_collection_videos(self, collection_id: int, collection_type: str = 'auto') -> List[Dict]:
-        """获取合集中的所有视频"""
-        try:
-            # 自动检测合集类型
-            if collection_type == 'auto':
-                detected_type = None
-                collection = None
-                
-                # 先尝试作为新版合集(season)
-                try:
-                    self.logger.info(f"尝试将合集 {collection_id} 作为 SEASON 类型检测...")
-                    test_collection = ChannelSeries(
-                        type_=ChannelSeriesType.SEASON, 
-                        id_=collection_id, 
-                        credential=self.credential
-                    )
-                    # 尝试获取第一页视频数据来验证类型
-                    test_videos = await self._get_collection_videos_page(test_collection, 1, 1)
-                    if test_videos and 'episodes' in test_videos:
-                        detected_type = 'season'
-                        collection = test_collection
-                        self.logger.info(f"成功检测到 SEASON 类型合集")
-                except Exception as e:
-                    self.logger.info(f"SEASON 类型检测失败: {e}")
-                
-                # 如果SEASON失败，尝试作为旧版合集(series)
-                if not detected_type:
-                    try:
-                        self.logger.info(f"尝试将合集 {collection_id} 作为 SERIES 类型检测...")
-                        test_collection = ChannelSeries(
-                            type_=ChannelSeriesType.SERIES, 
-                            id_=collection_id, 
-                            credential=self.credential
-                        )
-                        # 尝试获取第一页视频数据来验证类型
-                        test_videos = await self._get_collection_videos_page(test_collection, 1, 1)
-                        if test_videos and 'archives' in test_videos:
-                            detected_type = 'series'
-                            collection = test_collection
-                            self.logger.info(f"成功检测到 SERIES 类型合集")
-                    except Exception as e:
-                        self.logger.info(f"SERIES 类型检测失败: {e}")
-                
-                if not detected_type:
-                    raise Exception(f"无法自动检测合集 {collection_id} 的类型，请手动指定 --type series 或 --type season")
-                
-                collection_type = detected_type
-            else:
-                # 使用指定类型
-                series_type = ChannelSeriesType.SEASON if collection_type == 'season' else ChannelSeriesType.SERIES
-                collection = ChannelSeries(
-                    type_=series_type, 
-                    id_=collection_id, 
-                    credential=self.credential
-                )
+    async def _resolve_collection(self, collection_id: int, collection_type: str = 'auto') -> Tuple[ChannelSeries, str, Dict]:
+        """
+        解析合集对象、类型和元数据，类型检测结果按合集ID缓存
+        
+        Args:
+            collection_id: 合集ID
+            collection_type: 合集类型(auto/season/series)
             
-            all_videos = []
-            page = 1
-            page_size = 100
+        Returns:
+            (合集对象, 合集类型, 元数据)
             
-            while True:
-                try:
-                    videos_data = await self._get_collection_videos_page(collection, page, page_size)
-                    if not videos_data:
-                        break
+        Raises:
+            Exception: 自动检测合集类型失败
+        """
+        cached = self._collection_cache.get(collection_id)
+        if cached and collection_type in ('auto', cached[0]):
+            detected_type, collection = cached
+        elif collection_type == 'auto':
+            detected_type, collection = await self._detect_collection_type(collection_id)
+        else:
+            # 使用指定类型
+            series_type = ChannelSeriesType.SEASON if collection_type == 'season' else ChannelSeriesType.SERIES
+            collection = self._get_channel_series(collection_id, series_type)
+            detected_type = collection_type
+            self._collection_cache[collection_id] = (detected_type, collection)
+        
+        meta_key = (collection_id, detected_type)
+        meta = self._collection_meta_cache.get(meta_key)
+        if meta is None:
+            meta = await self._get_collection_meta(collection) or {}
+            if meta:
+                # 获取失败时不缓存，下次解析仍会重试
+                self._collection_meta_cache[meta_key] = meta
+        return collection, detected_type, meta
 
-                    if collection_type == 'season':
-                        videos = videos_data.get('episodes', [])
-                        for video_info in videos:
-                            video_data = {
-                                'title': video_info.get('title', 'Unknown'),
-                                'bvid': video_info.get('bvid', ''),
-                                'aid': video_info.get('aid', 0),
-                                'duration': video_info.get('duration', 0),
-                                'view': video_info.get('stat', {}).get('view', 0),
-                                'created': video_info.get('pubdate', 0)
-                            }
-                            all_videos.append(video_data)
-                    else:
-                        videos = videos_data.get('archives', [])
-                        for video_info in videos:
-                            video_data = {
-                                'title': video_info.get('title', 'Unknown'),
-                                'bvid': video_info.get('bvid', ''),
-                                'aid': video_info.get('aid', 0),
-                                'duration': video_info.get('duration', 0),
-                                'view': video_info.get('stat', {}).get('view', 0),
-                                'created': video_info.get('pubdate', 0)
-                            }
-                            all_videos.append(video_data)
-                    
-                    if not videos or len(videos) < page_size:
-                        break
-                        
-                    page += 1
-                    await asyncio.sleep(0.5)  # 避免请求过快
-                    
-                except Exception as e:
-                    self.logger.error(f"获取第{page}页视频列表失败: {e}")
-                    break
+    async def _detect_collection_type(self, collection_id: int) -> Tuple[str, ChannelSeries]:
+        """
+        自动检测合集类型，结果按合集ID缓存
+        
+        Returns:
+            (合集类型, 合集对象)
             
+        Raises:
+            Exception: SEASON 与 SERIES 均检测失败
+        """
+        cached = self._collection_cache.get(collection_id)
+        if cached:
+            return cached
+        
+        # SEASON 与 SERIES 两种探测相互独立，同时发起；始终优先 SEASON：
+        # SERIES 先返回时继续等待 SEASON，只有 SEASON 失败才采用 SERIES
+        self.logger.info(f"尝试将合集 {collection_id} 作为 SEASON / SERIES 类型检测...")
+        season_task = asyncio.ensure_future(self._probe_collection(collection_id, ChannelSeriesType.SEASON, 'episodes'))
+        series_task = asyncio.ensure_future(self._probe_collection(collection_id, ChannelSeriesType.SERIES, 'archives'))
+        detected_type = None
+        collection = None
+        pending = {season_task, series_task}
+        try:
+            while pending and not detected_type:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if not season_task.done():
+                    continue
+                if season_task.result():
+                    detected_type, (collection, first_page) = 'season', season_task.result()
+                elif series_task.done() and series_task.result():
+                    detected_type, (collection, first_page) = 'series', series_task.result()
+        finally:
+            # 已确定类型时取消仍在进行的探测
+            season_task.cancel()
+            series_task.cancel()
+        
+        if detected_type:
+            self.logger.info(f"成功检测到 {detected_type.upper()} 类型合集")
+        if not detected_type:
+            raise Exception(f"无法自动检测合集 {collection_id} 的类型，请手动指定 --type series 或 --type season")
+        
+        # 探测结果即完整的第一页，留给随后的分页获取直接使用
+        self._probed_first_pages[(collection_id, collection.get_type())] = first_page
+        self._collection_cache[collection_id] = (detected_type, collection)
+        return detected_type, collection
+
+    def _get_channel_series(self, collection_id: int, series_type: ChannelSeriesType) -> ChannelSeries:
+        """获取合集对象，同一ID与类型只构造一次（探测、指定类型及回退路径共用）"""
+        key = (collection_id, series_type)
+        collection = self._channel_series_cache.get(key)
+        if collection is None:
+            collection = ChannelSeries(
+                type_=series_type, 
+                id_=collection_id, 
+                credential=self.credential
+            )
+            self._channel_series_cache[key] = collection
+        return collection
+
+    @api_retry_decorator(quiet=True)
+    async def _probe_collection_page(self, collection: ChannelSeries) -> Dict:
+        """类型探测用的第一页请求（按正常分页大小，结果留作第一页），类型不符时接口返回错误码属预期情况，返回None"""
+        return await collection.get_videos(sort=ChannelOrder.DEFAULT, pn=1, ps=COLLECTION_PAGE_SIZE)
+
+    async def _probe_collection(self, collection_id: int, series_type: ChannelSeriesType,
+                                list_key: str) -> Optional[Tuple[ChannelSeries, Dict]]:
+        """按指定类型请求合集第一页，包含 list_key 时返回(合集对象, 第一页数据)，否则返回None"""
+        test_collection = self._get_channel_series(collection_id, series_type)
+        # 尝试获取第一页视频数据来验证类型
+        test_videos = await self._probe_collection_page(test_collection)
+        if test_videos and list_key in test_videos:
+            return test_collection, test_videos
+        self.logger.info(f"{series_type.name} 类型检测失败")
+        return None
+
+    async def get_collection_videos(self, collection_id: int, collection_type: str = 'auto') -> List[CollectionVideo]:
+        """获取合集中的所有视频"""
+        try:
+            collection, collection_type, meta = await self._resolve_collection(collection_id, collection_type)
+        except Exception as e:
+            self.logger.error(f"获取合集视频失败: {e}")
+            return []
+        return await self._get_resolved_collection_videos(collection, collection_type, self._meta_total(meta))
+
+    async def _get_resolved_collection_videos(self, collection: ChannelSeries, collection_type: str,
+                                              total_hint: int = 0) -> List[CollectionVideo]:
+        """获取已解析合集中的所有视频"""
+        try:
+            all_videos = []
+            _, pages = await self._open_collection_pages(collection, collection_type, total_hint)
+            async for videos in pages:
+                all_videos.extend(videos)
             return all_videos
         except Exception as e:
             self.logger.error(f"获取合集视频失败: {e}")
             return []
     
+    async def _open_collection_pages(self, collection: ChannelSeries, collection_type: str,
+                                     total_hint: int = 0) -> Tuple[int, AsyncIterator[List[CollectionVideo]]]:
+        """
+        获取合集视频总数及逐页产出视频的异步迭代器
+        
+        只等待第一页即可返回，其余分页在迭代时按页序并发预取，
+        调用方无需等全部分页到齐就能开始处理。
+        
+        Args:
+            collection: 合集对象
+            collection_type: 合集类型(season/series)
+            total_hint: 元数据中的视频总数，给出时后续分页与第一页同时发起
+            
+        Returns:
+            (视频总数, 按页产出 CollectionVideo 列表的异步迭代器)
+        """
+        page_size = COLLECTION_PAGE_SIZE
+        semaphore = asyncio.Semaphore(PAGE_FETCH_CONCURRENCY)
+        
+        async def fetch(page: int) -> Optional[Dict]:
+            async with semaphore:
+                return await self._get_collection_videos_page(collection, page, page_size)
+        
+        # 页号 -> 预取任务；以元数据总数预估页数，不必等第一页返回
+        prefetched = {page: asyncio.ensure_future(fetch(page))
+                      for page in range(2, math.ceil(total_hint / page_size) + 1)}
+        try:
+            # 类型探测时已取得的第一页只使用一次，之后再次列出仍请求最新数据
+            first_page = (self._probed_first_pages.pop((collection.id_, collection.get_type()), None)
+                          or await self._get_collection_videos_page(collection, 1, page_size))
+        except BaseException:
+            for task in prefetched.values():
+                task.cancel()
+            raise
+        
+        total = first_page.get('page', {}).get('total', 0) if first_page else 0
+        # 实际页数以第一页返回的总数为准，补齐预估不足的分页，多预取的直接取消
+        tasks = [prefetched.pop(page, None) or asyncio.ensure_future(fetch(page))
+                 for page in range(2, math.ceil(total / page_size) + 1)]
+        for task in prefetched.values():
+            task.cancel()
+        # 列表字段只与合集类型有关，每个合集确定一次，逐页解析时不再判断类型
+        list_key = 'episodes' if collection_type == 'season' else 'archives'
+        return total, self._iter_collection_pages(list_key, first_page, tasks)
+    
+    async def _iter_collection_pages(self, list_key: str, first_page: Optional[Dict],
+                                     tasks: List["asyncio.Future"]) -> AsyncIterator[List[CollectionVideo]]:
+        """按页序产出合集视频，第二页起的分页任务已在并发预取"""
+        try:
+            if not first_page:
+                return
+            yield self._parse_collection_page(first_page, list_key)
+            for page, task in enumerate(tasks, 2):
+                videos_data = await task
+                if not videos_data:
+                    self.logger.error(f"获取第{page}页视频列表失败")
+                    continue
+                yield self._parse_collection_page(videos_data, list_key)
+        finally:
+            # 调用方提前结束迭代时取消尚未完成的预取
+            for task in tasks:
+                task.cancel()
+    
+    @staticmethod
+    def _parse_collection_page(videos_data: Dict, list_key: str) -> List[CollectionVideo]:
+        """将一页合集接口数据中 list_key(episodes/archives) 下的条目转换为 CollectionVideo 列表"""
+        from_api = CollectionVideo.from_api
+        return [from_api(video_info) for video_info in videos_data.get(list_key, [])]
+    
     async def download_collection_videos(self, collection_id: int, collection_type: str = 'auto', collection_name: str = None, download_danmaku: bool = True) -> None:
         """下载合集中的所有视频"""
         try:
-            # 获取合集信息
+            # 解析合集（类型检测与元数据只请求一次）
+            try:
+                collection, collection_type, meta = await self._resolve_collection(collection_id, collection_type)
+            except Exception:
+                if collection_type != 'auto':
+                    raise
+                # 默认使用series类型
+                self.logger.warning(f"无法自动检测合集类型，默认使用 SERIES 类型")
+                collection, collection_type, meta = await self._resolve_collection(collection_id, 'series')
+            
             if not collection_name:
-                if collection_type == 'auto':
-                    # 使用改进的自动检测逻辑
-                    detected_type = None
-                    
-                    # 先尝试作为新版合集(season)
-                    try:
-                        self.logger.info(f"尝试将合集 {collection_id} 作为 SEASON 类型检测...")
-                        test_collection = ChannelSeries(
-                            type_=ChannelSeriesType.SEASON, 
-                            id_=collection_id, 
-                            credential=self.credential
-                        )
-                        # 尝试获取第一页视频数据来验证类型
-                        test_videos = await self._get_collection_videos_page(test_collection, 1, 1)
-                        if test_videos and 'episodes' in test_videos:
-                            meta = await self._get_collection_meta(test_collection)
-                            if not meta: raise Exception("Failed to get meta after refresh")
-                            collection_name = meta.get('name', meta.get('title', f'Season_{collection_id}'))
-                            detected_type = 'season'
-                            self.logger.info(f"成功检测到 SEASON 类型合集")
-                    except Exception as e:
-                        self.logger.info(f"SEASON 类型检测失败: {e}")
-                    
-                    # 如果SEASON失败，尝试作为旧版合集(series)
-                    if not detected_type:
-                        try:
-                            self.logger.info(f"尝试将合集 {collection_id} 作为 SERIES 类型检测...")
-                            test_collection = ChannelSeries(
-                                type_=ChannelSeriesType.SERIES, 
-                                id_=collection_id, 
-                                credential=self.credential
-                            )
-                            # 尝试获取第一页视频数据来验证类型
-                            test_videos = await self._get_collection_videos_page(test_collection, 1, 1)
-                            if test_videos and 'archives' in test_videos:
-                                meta = await self._get_collection_meta(test_collection)
-                                if not meta: raise Exception("Failed to get meta after refresh")
-                                collection_name = meta.get('name', meta.get('title', f'Series_{collection_id}'))
-                                detected_type = 'series'
-                                self.logger.info(f"成功检测到 SERIES 类型合集")
-                        except Exception as e:
-                            self.logger.info(f"SERIES 类型检测失败: {e}")
-                    
-                    if not detected_type:
-                        collection_name = f'Collection_{collection_id}'
-                        # 默认使用series类型
-                        detected_type = 'series'
-                        self.logger.warning(f"无法自动检测合集类型，默认使用 SERIES 类型")
-                    
-                    collection_type = detected_type
-                else:
-                    series_type = ChannelSeriesType.SEASON if collection_type == 'season' else ChannelSeriesType.SERIES
-                    collection = ChannelSeries(
-                        type_=series_type, 
-                        id_=collection_id, 
-                        credential=self.credential
-                    )
-                    meta = await self._get_collection_meta(collection)
-                    if not meta: raise Exception("Failed to get meta after refresh")
-                    collection_name = meta.get('name', meta.get('title', f'Collection_{collection_id}'))
+                collection_name = meta.get('name', meta.get('title', f'Collection_{collection_id}'))
             
             # 创建合集下载目录
-            safe_collection_name = "".join(c for c in collection_name if c.isalnum() or c in (' ', '-', '_', '.')).strip()
-            safe_collection_name = safe_collection_name[:50]  # 限制长度
+            safe_collection_name = _UNSAFE_COLLECTION_NAME_RE.sub('', collection_name).strip()[:50]  # 限制长度
             collection_folder = self.download_dir / f"{safe_collection_name}_{collection_id}"
-            collection_folder.mkdir(parents=True, exist_ok=True)
+            await self._ensure_dir(collection_folder)
             
             self.logger.info(f"开始下载合集: {collection_name} ({collection_type.upper()})")
             self.logger.info(f"下载目录: {collection_folder}")
             
             # 获取所有视频
-            all_videos = await self.get_collection_videos(collection_id, collection_type)
+            all_videos = await self._get_resolved_collection_videos(collection, collection_type, self._meta_total(meta))
             if not all_videos:
                 print("❌ 未找到任何视频")
                 return
             
             print(f"\n共找到 {len(all_videos)} 个视频，开始批量下载...")
             
-            success_count = 0
-            failed_count = 0
-            
             # 检查ffmpeg
-            if not self.downloader.check_ffmpeg():
+            if not await self.downloader.check_ffmpeg():
                 print("⚠️  警告: 未找到 ffmpeg，可能无法正确处理某些视频")
                 print("请安装 ffmpeg: https://ffmpeg.org/")
             
-            # 创建下载任务
-            tasks = []
-            for video_info in all_videos:
-                if video_info.get('bvid'):
-                    task = self.downloader.download_single_video(video_info['bvid'], collection_folder, self.semaphore, download_danmaku)
-                    tasks.append(task)
-            
             # 执行下载
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    print(f"❌ 视频下载异常 {all_videos[i]['title']}: {result}")
-                    failed_count += 1
-                elif result:
-                    success_count += 1
-                else:
-                    failed_count += 1
+            videos = [(video_info.bvid, video_info.title) for video_info in all_videos if video_info.bvid]
+            success_count, failed_count = await self._download_videos(videos, collection_folder, download_danmaku)
             
             print(f"\n📊 合集下载完成！成功: {success_count}, 失败: {failed_count}")
             
@@ -1170,49 +1958,49 @@ class BilibiliVideoManager:
         
         print(f"总共 {len(collections)} 个合集\n")
         
+        # 拼接全部合集信息后一次性写入，避免每个合集多次print
+        lines = []
         for i, collection in enumerate(collections, 1):
-            collection_name = collection['name']
-            collection_id = collection['id']
-            collection_type = collection['type'].upper()
-            total_videos = collection['total']
             created_time = datetime.fromtimestamp(collection.get('created_time', 0)).strftime('%Y-%m-%d')
-            
-            print(f"{i:3d}. {collection_name} [ID: {collection_id}]")
-            print(f"     📺 类型: {collection_type} | 🎬 视频数: {total_videos} | 📅 创建: {created_time}")
-            if collection.get('description'):
-                description = collection['description'][:100]
-                print(f"     📝 {description}{'...' if len(collection['description']) > 100 else ''}")
-            print()
+            lines.append(COLLECTION_INFO_TMPL.format(
+                i, collection['name'], collection['id'], collection['type'].upper(), collection['total'], created_time))
+            description = collection.get('description')
+            if description:
+                lines.append(f"     📝 {description[:100]}{'...' if len(description) > 100 else ''}\n")
+            lines.append("\n")
+        
+        sys.stdout.write(''.join(lines))
+        sys.stdout.flush()
     
     async def list_collection_videos(self, collection_id: int, collection_type: str = 'auto') -> None:
-        """列出合集中的所有视频"""
+        """列出合集中的所有视频（逐页输出，首页到达即开始显示）"""
         try:
-            # 获取视频列表
-            videos = await self.get_collection_videos(collection_id, collection_type)
-            if not videos:
+            try:
+                collection, resolved_type, meta = await self._resolve_collection(collection_id, collection_type)
+                total, pages = await self._open_collection_pages(collection, resolved_type, self._meta_total(meta))
+            except Exception as e:
+                self.logger.error(f"获取合集视频失败: {e}")
+                total = 0
+            if not total:
                 print(f"❌ 未找到任何视频 (合集ID: {collection_id}, 类型: {collection_type})")
                 return
             
             print(f"\n合集 {collection_id} 中的视频 (类型: {collection_type.upper()})")
-            print(f"总共 {len(videos)} 个视频\n")
+            print(f"总共 {total} 个视频\n")
             
-            for i, video_info in enumerate(videos, 1):
-                title = video_info['title']
-                bvid = video_info['bvid']
-                duration = video_info.get('duration', 0)
-                view_count = video_info.get('view', 0)
-                
-                if duration > 0:
-                    minutes = duration // 60
-                    seconds = duration % 60
-                    duration_str = f"{minutes:02d}:{seconds:02d}"
-                else:
-                    duration_str = "--:--"
+            i = 0
+            fmt_views = _fmt_views
+            async for videos in pages:
+                # 每页拼接完整后一次性写入，避免每个视频多次print
+                lines = []
+                # CollectionVideo 为 NamedTuple，直接按位置解包，省去逐个属性访问
+                for i, (title, bvid, _aid, duration, view_count, _created) in enumerate(videos, i + 1):
+                    duration_str = "%02d:%02d" % divmod(duration, 60) if duration > 0 else "--:--"
+                    lines.append(COLLECTION_LINE_TMPL.format(i, title, bvid, duration_str, fmt_views(view_count)))
                 
-                print(f"{i:3d}. {title} [{bvid}]")
-                print(f"     ⏱️  {duration_str} | 👁️  {view_count:,} 播放")
-                print()
+                sys.stdout.write(''.join(lines))
+                sys.stdout.flush()
                 
         except Exception as e:
-            self.logger.error(f"获取合集视频列表失败: {e}")
+            self.logger.error("获取合集视频列表失败: %s", e)
             print(f"❌ 获取合集视频列表失败: {e}")
\ No newline at end of file